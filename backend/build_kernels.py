@@ -0,0 +1,47 @@
+"""
+Ahead-of-time build of the hot numba kernels.
+
+Compiles the scalar projection and the policy's pad/normalize kernel into a
+native extension (sisyphus_kernels) next to this file. projection.py and
+policy_kernels.py import it when present, so fresh processes skip JIT compile
+entirely; otherwise they fall back to the @njit(cache=True) kernels.
+
+Usage:
+    python build_kernels.py
+
+Rebuild after editing either kernel. The AOT pad/normalize kernel runs
+serially (pycc does not support parallel=True), which is fine for the
+padded object counts used in rollouts.
+"""
+
+from pathlib import Path
+
+from numba_compat import NUMBA_AVAILABLE
+
+
+def build(output_dir: Path = Path(__file__).parent):
+    """Compile sisyphus_kernels into output_dir."""
+    if not NUMBA_AVAILABLE:
+        raise RuntimeError("numba is required to build AOT kernels (pip install numba)")
+
+    from numba.pycc import CC
+
+    from projection import _project_nb
+    from policy_kernels import _pad_and_normalize_nb
+
+    cc = CC('sisyphus_kernels')
+    cc.output_dir = str(output_dir)
+
+    cc.export('project', 'UniTuple(i8, 2)(f8, f8, i8, i8, f8, i8)')(_project_nb.py_func)
+    cc.export(
+        'pad_and_normalize',
+        'void(f4[:, ::1], f4[::1], f4[::1], f4[:, ::1], b1[::1])'
+    )(_pad_and_normalize_nb.py_func)
+
+    cc.compile()
+    return output_dir
+
+
+if __name__ == "__main__":
+    out = build()
+    print(f"✓ Built sisyphus_kernels in {out}")
@@ -22,6 +22,10 @@ Instructions:
     5. Coordinates saved to world_calibration_manual.py
 """
 
+import os
+import time
+from collections import deque
+
 import cv2
 import numpy as np
 from pathlib import Path
@@ -36,6 +40,18 @@ class CalibrationTool:
         self.current_world = 1
         self.clicks = []
 
+        # Persistent drawing buffers (allocated once the image size is known)
+        self.overlay = None
+        self.status_strip = None
+        self._blend_buf = None
+
+        # Raw click events queued by the mouse callback, drained in the main loop
+        self._events = deque()
+
+        # Instruction banner, rasterized once (per-world header cached on first use)
+        self._instr_base = self._render_instructions_base()
+        self._instr_cache = {}
+
         # Updated for 3-object pick-and-place task
         self.labels = [
             'object_to_pickup',    # Red - the target object to move
@@ -62,39 +78,136 @@ class CalibrationTool:
         }
 
     def mouse_callback(self, event, x, y, flags, param):
-        """Handle mouse clicks."""
-        if event == cv2.EVENT_LBUTTONDOWN and len(self.clicks) < len(self.labels):
+        """Handle mouse clicks (only queues the event; see _process_events)."""
+        if event == cv2.EVENT_LBUTTONDOWN:
+            self._events.append((x, y))
+
+    def _process_events(self):
+        """Drain queued clicks: record and draw them, redraw once, then print."""
+        if not self._events:
+            return
+
+        messages = []
+        while self._events:
+            x, y = self._events.popleft()
+            if len(self.clicks) >= len(self.labels):
+                continue
+
             self.clicks.append((x, y))
             label = self.labels[len(self.clicks) - 1]
-            print(f"  ✓ {self.descriptions[label]}: pixel ({x}, {y})")
+            self._draw_click(len(self.clicks) - 1)
+            messages.append(f"  ✓ {self.descriptions[label]}: pixel ({x}, {y})")
 
-            # Redraw image with all clicks
-            self.redraw_image()
+        self.redraw_image()
+        if messages:
+            print("\n".join(messages))
 
-    def redraw_image(self):
-        """Redraw image with current clicks."""
-        img = self.base_image.copy()
+    def _draw_click(self, i: int):
+        """Draw a single click onto the persistent overlay."""
+        x, y = self.clicks[i]
+        label = self.labels[i]
+        color = self.colors[label]
 
-        for i, (x, y) in enumerate(self.clicks):
-            label = self.labels[i]
-            color = self.colors[label]
+        # Draw filled circle (smaller, 3px)
+        cv2.circle(self.overlay, (x, y), 3, color, -1)
 
-            # Draw filled circle (smaller, 3px)
-            cv2.circle(img, (x, y), 3, color, -1)
+        # Draw outline for visibility
+        cv2.circle(self.overlay, (x, y), 6, (0, 0, 0), 1)  # Black outline
 
-            # Draw outline for visibility
-            cv2.circle(img, (x, y), 6, (0, 0, 0), 1)  # Black outline
+        # Add label text
+        cv2.putText(self.overlay, str(i+1), (x + 8, y - 8),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
 
-            # Add label text
-            cv2.putText(img, str(i+1), (x + 8, y - 8),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
+    def _reset_overlay(self):
+        """Restore the overlay to the clean base image (no clicks drawn)."""
+        if self.overlay is None or self.overlay.shape != self.base_image.shape:
+            self.overlay = self.base_image.copy()
+        else:
+            np.copyto(self.overlay, self.base_image)
+
+        # Drop any clicks queued but not yet processed
+        self._events.clear()
+
+        # Pre-allocated bottom strip backing the status banner
+        h, w = self.base_image.shape[:2]
+        self.status_strip = np.zeros((min(24, h), w, 3), np.uint8)
 
-        # Show completion status
+    def redraw_image(self):
+        """Show the overlay with the current status banner."""
+        h = self.overlay.shape[0]
+        bottom = self.overlay[-self.status_strip.shape[0]:]
+
+        # Save the clean bottom rows, draw status in place, show, then restore
+        np.copyto(self.status_strip, bottom)
         status_text = f"World {self.current_world}: {len(self.clicks)}/{len(self.labels)} positions marked"
-        cv2.putText(img, status_text, (10, img.shape[0] - 10),
+        cv2.putText(self.overlay, status_text, (10, h - 10),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
 
-        cv2.imshow('Calibration', img)
+        cv2.imshow('Calibration', self.overlay)
+        np.copyto(bottom, self.status_strip)
+
+    def _instructions_bitmap(self, world_id: int) -> np.ndarray:
+        """Get the instruction text for a world, rasterized once onto a black 220×450 bitmap."""
+        if world_id not in self._instr_cache:
+            bitmap = self._instr_base.copy()
+            cv2.putText(bitmap, f"=== WORLD {world_id} CALIBRATION ===", (10, 20),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1, cv2.LINE_AA)
+            self._instr_cache[world_id] = bitmap
+        return self._instr_cache[world_id]
+
+    @staticmethod
+    def _render_instructions_base() -> np.ndarray:
+        """Rasterize the world-independent instruction lines (header is added per world)."""
+        text_lines = [
+            "",  # Header: "=== WORLD {world_id} CALIBRATION ==="
+            "",
+            "Click positions IN ORDER:",
+            "1. RED:    Object to pick up (on table)",
+            "2. BLUE:   Obstacle 1 (on table)",
+            "3. YELLOW: Obstacle 2 (on table)",
+            "4. WHITE:  Gripper start (on table, away from objects)",
+            "5. GREEN:  Target zone (on table, where to place object)",
+            "",
+            "Controls:",
+            "  's' = Save and next world",
+            "  'r' = Reset (redo clicks)",
+            "  'q' = Quit without saving"
+        ]
+
+        bitmap = np.zeros((220, 450, 3), np.uint8)
+        y_offset = 20
+        for line in text_lines:
+            if line:
+                cv2.putText(bitmap, line, (10, y_offset),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.4, (200, 200, 200), 1, cv2.LINE_AA)
+            y_offset += 18
+        return bitmap
+
+    @staticmethod
+    def _find_exterior_image(world_dir: Path):
+        """Return the path of the first *exterior*.png in world_dir, or None (stops at first hit)."""
+        try:
+            with os.scandir(world_dir) as entries:
+                for entry in entries:
+                    if 'exterior' in entry.name and entry.name.endswith('.png'):
+                        return entry.path
+        except FileNotFoundError:
+            pass
+        return None
+
+    @staticmethod
+    def _read_image(img_path: str):
+        """Decode an image from an unbuffered one-shot read (returns None on failure)."""
+        with open(img_path, 'rb', buffering=0) as f:
+            data = np.frombuffer(f.read(), np.uint8)
+        return cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+    @staticmethod
+    def _poll_key() -> int:
+        """Non-blocking key poll (falls back to waitKey(1) on OpenCV < 4.5)."""
+        if hasattr(cv2, 'pollKey'):
+            return cv2.pollKey()
+        return cv2.waitKey(1)
 
     def calibrate_world(self, world_id: int):
         """Calibrate a single world."""
@@ -103,14 +216,13 @@ class CalibrationTool:
 
         # Load exterior image
         world_dir = self.assets_dir / f"world{world_id}"
-        exterior_files = list(world_dir.glob("*exterior*.png"))
+        img_path = self._find_exterior_image(world_dir)
 
-        if not exterior_files:
+        if img_path is None:
             print(f"✗ No exterior image found for world {world_id}")
             return False
 
-        img_path = exterior_files[0]
-        self.base_image = cv2.imread(str(img_path))
+        self.base_image = self._read_image(img_path)
 
         if self.base_image is None:
             print(f"✗ Failed to load {img_path}")
@@ -120,42 +232,34 @@ class CalibrationTool:
 
         # Resize for easier clicking if too large
         if w > 800:
-            scale = 800 / w
-            self.base_image = cv2.resize(self.base_image, None, fx=scale, fy=scale)
-            self.scale_factor = scale
+            new_w, new_h = 800, int(h * 800 / w)
+            self.base_image = cv2.resize(
+                self.base_image,
+                (new_w, new_h),
+                interpolation=cv2.INTER_AREA  # INTER_AREA best for downsampling
+            )
+            self.scale_factor = new_w / w
         else:
             self.scale_factor = 1.0
 
+        self._reset_overlay()
+
         # Show instructions
         instructions = self.base_image.copy()
 
-        # Dark semi-transparent overlay for readability
-        overlay = instructions.copy()
-        cv2.rectangle(overlay, (0, 0), (450, 220), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.6, instructions, 0.4, 0, instructions)
-
-        text_lines = [
-            f"=== WORLD {world_id} CALIBRATION ===",
-            "",
-            "Click positions IN ORDER:",
-            "1. RED:    Object to pick up (on table)",
-            "2. BLUE:   Obstacle 1 (on table)",
-            "3. YELLOW: Obstacle 2 (on table)",
-            "4. WHITE:  Gripper start (on table, away from objects)",
-            "5. GREEN:  Target zone (on table, where to place object)",
-            "",
-            "Controls:",
-            "  's' = Save and next world",
-            "  'r' = Reset (redo clicks)",
-            "  'q' = Quit without saving"
-        ]
+        # Dark semi-transparent overlay for readability (scratch buffer reused across worlds)
+        if self._blend_buf is None or self._blend_buf.shape != instructions.shape:
+            self._blend_buf = np.empty_like(instructions)
+        np.copyto(self._blend_buf, instructions)
+        cv2.rectangle(self._blend_buf, (0, 0), (450, 220), (0, 0, 0), -1)
+        cv2.addWeighted(self._blend_buf, 0.6, instructions, 0.4, 0, dst=instructions)
 
-        y_offset = 20
-        for line in text_lines:
-            color = (255, 255, 255) if line.startswith("=") else (200, 200, 200)
-            cv2.putText(instructions, line, (10, y_offset),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1, cv2.LINE_AA)
-            y_offset += 18
+        # Blit pre-rasterized instruction text over the darkened region
+        bitmap = self._instructions_bitmap(world_id)
+        bh = min(bitmap.shape[0], instructions.shape[0])
+        bw = min(bitmap.shape[1], instructions.shape[1])
+        roi = instructions[:bh, :bw]
+        cv2.add(roi, bitmap[:bh, :bw], dst=roi)
 
         cv2.imshow('Calibration', instructions)
         cv2.setMouseCallback('Calibration', self.mouse_callback)
@@ -166,7 +270,13 @@ class CalibrationTool:
         print("Click 5 positions on the image...")
 
         while True:
-            key = cv2.waitKey(1) & 0xFF
+            self._process_events()
+
+            key = self._poll_key()
+            if key == -1:
+                time.sleep(0.002)
+                continue
+            key &= 0xFF
 
             if key == ord('s') and len(self.clicks) == len(self.labels):
                 # Save calibration - scale to 224×224
@@ -190,6 +300,7 @@ class CalibrationTool:
             elif key == ord('r'):
                 # Reset clicks
                 self.clicks = []
+                self._reset_overlay()
                 print("\n  ⟳ Reset. Click again...")
                 cv2.imshow('Calibration', self.base_image)
 
@@ -207,7 +318,7 @@ class CalibrationTool:
         """Save all calibrations to Python file."""
         output_file = Path(__file__).parent / "world_calibration_manual.py"
 
-        content = '''"""
+        parts = ['''"""
 Manually calibrated pixel positions for each world.
 Generated by calibration_tool.py
 
@@ -220,28 +331,48 @@ Task: Pick and place with obstacles
 All positions are in 224×224 pixel coordinates.
 """
 
+import numpy as np
 from typing import Dict, Tuple
 
 MANUAL_CALIBRATIONS = {
-'''
+''']
 
         for world_id in sorted(self.calibrations.keys()):
             positions = self.calibrations[world_id]
-            content += f"    {world_id}: {{\n"
+            parts.append(f"    {world_id}: {{\n")
             for label, (x, y) in positions.items():
-                content += f"        '{label}': ({x}, {y}),\n"
-            content += "    },\n\n"
+                parts.append(f"        '{label}': ({x}, {y}),\n")
+            parts.append("    },\n\n")
+
+        parts.append("""}
+
+LABELS = ('object_to_pickup', 'obstacle_1', 'obstacle_2', 'gripper_start', 'target_zone')
+LABEL_IDX = {label: i for i, label in enumerate(LABELS)}
+
+# Contiguous (N_worlds, 5, 2) table: CALIBRATIONS[WORLD_IDX[world_id], LABEL_IDX[label]] = (x, y)
+WORLD_IDX = {world_id: i for i, world_id in enumerate(sorted(MANUAL_CALIBRATIONS))}
+CALIBRATIONS = np.array(
+    [[MANUAL_CALIBRATIONS[world_id][label] for label in LABELS] for world_id in sorted(MANUAL_CALIBRATIONS)],
+    dtype=np.int16
+)
+CALIBRATIONS.flags.writeable = False
 
-        content += """}
 
 def get_manual_positions(world_id: int) -> Dict[str, Tuple[int, int]]:
     \"\"\"Get manually calibrated positions for a world.\"\"\"
     if world_id not in MANUAL_CALIBRATIONS:
         raise ValueError(f"No calibration for world {world_id}. Available: {list(MANUAL_CALIBRATIONS.keys())}")
     return MANUAL_CALIBRATIONS[world_id]
-"""
 
-        output_file.write_text(content)
+
+def get_manual_positions_array(world_id: int) -> np.ndarray:
+    \"\"\"Get manually calibrated positions for a world as a read-only (5, 2) int16 array in LABELS order.\"\"\"
+    if world_id not in WORLD_IDX:
+        raise ValueError(f"No calibration for world {world_id}. Available: {list(MANUAL_CALIBRATIONS.keys())}")
+    return CALIBRATIONS[WORLD_IDX[world_id]]
+""")
+
+        output_file.write_bytes(''.join(parts).encode('utf-8'))
         print(f"\n{'='*50}")
         print(f"✓ ALL CALIBRATIONS SAVED")
         print(f"{'='*50}")
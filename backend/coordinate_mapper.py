@@ -3,9 +3,26 @@ Bidirectional coordinate mapping between pixels and 3D world coordinates.
 Handles the conversion from manual pixel positions to PyBullet 3D physics coordinates.
 """
 
+import math
 import numpy as np
-from typing import Tuple
-from world_calibration_manual import get_manual_positions, MANUAL_CALIBRATIONS
+from functools import lru_cache
+from typing import Optional, Tuple
+from numba_compat import njit, NUMBA_AVAILABLE
+from world_calibration_manual import get_manual_positions, get_manual_positions_array, LABELS, LABEL_IDX
+
+
+@njit(cache=True, fastmath=True)
+def _pixels_to_world_kernel(pixels, cx, cy, inv_ppm, z_values, out):
+    """Fused pixel → world conversion (one pass, no intermediate arrays)."""
+    for i in range(pixels.shape[0]):
+        out[i, 0] = (pixels[i, 0] - cx) * inv_ppm
+        out[i, 1] = -(pixels[i, 1] - cy) * inv_ppm
+        out[i, 2] = z_values[i]
+
+
+if NUMBA_AVAILABLE:
+    # Warm the JIT at import so the first reset doesn't pay compile latency
+    _pixels_to_world_kernel(np.zeros((1, 2)), 0.0, 0.0, 1.0, np.zeros(1), np.empty((1, 3)))
 
 
 class CoordinateMapper:
@@ -21,9 +38,25 @@ class CoordinateMapper:
     FLOOR_Z = 0.02  # Floor level (just above ground plane)
     GRIPPER_START_Z = 0.88  # Gripper starting height (slightly above objects)
 
+    # z_level name → Z coordinate (hash lookup instead of an if/elif chain)
+    _Z_LOOKUP = {
+        'table': OBJECT_ON_TABLE_Z,
+        'floor': FLOOR_Z,
+        'gripper': GRIPPER_START_Z,
+    }
+
     # Image dimensions
     IMAGE_SIZE = 224
 
+    # Z-level for each calibrated object (target zone is on the floor)
+    OBJECT_Z_LEVELS = {
+        'object_to_pickup': 'table',
+        'obstacle_1': 'table',
+        'obstacle_2': 'table',
+        'gripper_start': 'gripper',
+        'target_zone': 'floor',
+    }
+
     def __init__(self, world_id: int):
         """
         Initialize mapper for a specific world.
@@ -33,6 +66,10 @@ class CoordinateMapper:
         """
         self.world_id = world_id
         self.manual_positions = get_manual_positions(world_id)
+        self.manual_positions_px = get_manual_positions_array(world_id)  # (5, 2) in LABELS order
+
+        # Initial 3D object positions (filled on first request)
+        self._initial_positions_3d: Optional[np.ndarray] = None
 
         # Derive world coordinate system from manual positions
         # Use object positions to infer table center and scale
@@ -45,28 +82,20 @@ class CoordinateMapper:
         Uses the assumption that objects span approximately the table surface,
         which has known physical dimensions (~0.8m diameter for round tables).
         """
-        # Get all table-level object positions (excluding floor goal)
-        table_positions = [
-            self.manual_positions['object_to_pickup'],
-            self.manual_positions['obstacle_1'],
-            self.manual_positions['obstacle_2'],
-            self.manual_positions['gripper_start'],
-        ]
-
-        # Find bounding box of table objects in pixels
-        xs = [pos[0] for pos in table_positions]
-        ys = [pos[1] for pos in table_positions]
+        # Table-level object positions (excluding floor goal) as a (4, 2) array
+        table_positions = self.manual_positions_px[[
+            LABEL_IDX['object_to_pickup'],
+            LABEL_IDX['obstacle_1'],
+            LABEL_IDX['obstacle_2'],
+            LABEL_IDX['gripper_start'],
+        ]]
 
         # Table center (average of object positions)
-        self.table_center_px = (
-            int(np.mean(xs)),
-            int(np.mean(ys))
-        )
+        center = table_positions.mean(axis=0)
+        self.table_center_px = (int(center[0]), int(center[1]))
 
         # Table extent in pixels (how many pixels = table diameter)
-        table_span_x = max(xs) - min(xs)
-        table_span_y = max(ys) - min(ys)
-        table_span_px = max(table_span_x, table_span_y)
+        table_span_px = int((table_positions.max(axis=0) - table_positions.min(axis=0)).max())
 
         # Physical table size (assume ~0.6m diameter based on visible objects)
         table_diameter_meters = 0.6
@@ -78,6 +107,11 @@ class CoordinateMapper:
         self.world_x_range = (-0.4, 0.4)
         self.world_y_range = (-0.3, 0.3)
 
+        # Cached conversion constants (avoid per-call division/indexing)
+        self._cx, self._cy = self.table_center_px  # int, for pixel outputs
+        self._cx_f, self._cy_f = float(self._cx), float(self._cy)  # float, for world outputs
+        self._inv_ppm = 1.0 / self.pixels_per_meter
+
     def pixel_to_world_3d(self, pixel_pos: Tuple[int, int], z_level: str = 'table') -> np.ndarray:
         """
         Convert 2D pixel position to 3D world coordinates.
@@ -91,25 +125,40 @@ class CoordinateMapper:
         """
         px, py = pixel_pos
 
-        # Convert pixel offset from table center to world meters
-        offset_x_px = px - self.table_center_px[0]
-        offset_y_px = py - self.table_center_px[1]
-
-        # Convert pixels to meters
-        world_x = offset_x_px / self.pixels_per_meter
-        world_y = -offset_y_px / self.pixels_per_meter  # Negative (image Y is flipped)
-
-        # Assign Z based on level
-        if z_level == 'table':
-            world_z = self.OBJECT_ON_TABLE_Z
-        elif z_level == 'floor':
-            world_z = self.FLOOR_Z
-        elif z_level == 'gripper':
-            world_z = self.GRIPPER_START_Z
-        else:
+        world_z = self._Z_LOOKUP.get(z_level)
+        if world_z is None:
             raise ValueError(f"Unknown z_level: {z_level}")
 
-        return np.array([world_x, world_y, world_z])
+        # Pixel offset from table center → meters (image Y is flipped)
+        return np.array([
+            (px - self._cx_f) * self._inv_ppm,
+            -(py - self._cy_f) * self._inv_ppm,
+            world_z,
+        ])
+
+    def pixels_to_world_3d(self, pixels: np.ndarray, z_values: np.ndarray) -> np.ndarray:
+        """
+        Vectorized pixel_to_world_3d for N points at once.
+
+        Args:
+            pixels: (N, 2) array of (x, y) pixel coordinates
+            z_values: (N,) array of world Z coordinates (meters)
+
+        Returns:
+            (N, 3) array of [x, y, z] world coordinates (meters)
+        """
+        pixels = np.asarray(pixels, dtype=np.float64)
+        out = np.empty((len(pixels), 3), dtype=np.float64)
+
+        if NUMBA_AVAILABLE:
+            z_values = np.asarray(z_values, dtype=np.float64)
+            _pixels_to_world_kernel(pixels, self._cx_f, self._cy_f, self._inv_ppm, z_values, out)
+            return out
+
+        out[:, 0] = (pixels[:, 0] - self._cx_f) * self._inv_ppm
+        out[:, 1] = -(pixels[:, 1] - self._cy_f) * self._inv_ppm  # Image Y is flipped
+        out[:, 2] = z_values
+        return out
 
     def world_to_pixel_2d(self, world_pos: np.ndarray) -> Tuple[int, int]:
         """
@@ -121,19 +170,18 @@ class CoordinateMapper:
         Returns:
             (x, y) in pixel coordinates [0, 224)
         """
-        x, y, _ = world_pos  # Ignore Z for 2D projection
-
-        # Convert meters to pixel offset
-        offset_x_px = int(x * self.pixels_per_meter)
-        offset_y_px = int(-y * self.pixels_per_meter)  # Flip Y
+        # Ignore Z for 2D projection; plain floats avoid NumPy scalar dispatch
+        x = float(world_pos[0])
+        y = float(world_pos[1])
 
-        # Add to table center
-        px = self.table_center_px[0] + offset_x_px
-        py = self.table_center_px[1] + offset_y_px
+        # Meters → pixel offset from table center (flip Y)
+        px = self._cx + int(x * self.pixels_per_meter)
+        py = self._cy + int(-y * self.pixels_per_meter)
 
         # Clamp to image bounds
-        px = np.clip(px, 0, self.IMAGE_SIZE - 1)
-        py = np.clip(py, 0, self.IMAGE_SIZE - 1)
+        max_px = self.IMAGE_SIZE - 1
+        px = 0 if px < 0 else (max_px if px > max_px else px)
+        py = 0 if py < 0 else (max_px if py > max_px else py)
 
         return (px, py)
 
@@ -141,41 +189,39 @@ class CoordinateMapper:
         """
         Get 3D world positions for all manually calibrated objects.
 
+        Computed once per mapper (positions only depend on the world); the arrays are
+        read-only, copy one before modifying it.
+
         Returns:
             Dictionary mapping object names to 3D positions (meters)
         """
-        return {
-            'object_to_pickup': self.pixel_to_world_3d(
-                self.manual_positions['object_to_pickup'],
-                z_level='table'
-            ),
-            'obstacle_1': self.pixel_to_world_3d(
-                self.manual_positions['obstacle_1'],
-                z_level='table'
-            ),
-            'obstacle_2': self.pixel_to_world_3d(
-                self.manual_positions['obstacle_2'],
-                z_level='table'
-            ),
-            'gripper_start': self.pixel_to_world_3d(
-                self.manual_positions['gripper_start'],
-                z_level='gripper'
-            ),
-            'target_zone': self.pixel_to_world_3d(
-                self.manual_positions['target_zone'],
-                z_level='floor'  # Target is on floor
-            ),
-        }
+        if self._initial_positions_3d is None:
+            z_values = np.array([self._Z_LOOKUP[self.OBJECT_Z_LEVELS[name]] for name in LABELS])
+
+            positions = self.pixels_to_world_3d(self.manual_positions_px, z_values)
+            positions.flags.writeable = False
+            self._initial_positions_3d = positions
+
+        return dict(zip(LABELS, self._initial_positions_3d))
+
+
+@lru_cache(maxsize=8)
+def get_mapper(world_id: int) -> CoordinateMapper:
+    """Get the shared (cached) mapper for a world. Mappers are read-only after init."""
+    return CoordinateMapper(world_id)
 
 
 # Test and validation
 if __name__ == "__main__":
     print("Testing CoordinateMapper...\n")
 
+    # Round-trip test position (allocated once, reused for every world)
+    test_pos_3d = np.array([0.1, 0.05, 0.86])
+
     for world_id in [1, 2, 3]:
         print(f"=== World {world_id} ===")
 
-        mapper = CoordinateMapper(world_id)
+        mapper = get_mapper(world_id)
 
         print(f"  Table center (px): {mapper.table_center_px}")
         print(f"  Pixels per meter: {mapper.pixels_per_meter:.1f}")
@@ -189,11 +235,10 @@ if __name__ == "__main__":
 
         # Verify round-trip conversion
         print(f"\n  Round-trip verification (world → pixel → world):")
-        test_pos_3d = np.array([0.1, 0.05, 0.86])
         pixel_pos = mapper.world_to_pixel_2d(test_pos_3d)
         back_to_3d = mapper.pixel_to_world_3d(pixel_pos, z_level='table')
 
-        error = np.linalg.norm(test_pos_3d[:2] - back_to_3d[:2])  # Check XY only
+        error = math.hypot(test_pos_3d[0] - back_to_3d[0], test_pos_3d[1] - back_to_3d[1])  # Check XY only
         print(f"    Test position: {test_pos_3d}")
         print(f"    → Pixel: {pixel_pos}")
         print(f"    → Back to 3D: {back_to_3d}")
@@ -0,0 +1,68 @@
+"""
+Persistent .npy disk cache for decoded + resized asset images.
+
+Shared by ObservationBuilder (world backgrounds) and verify_calibration.py
+(exterior previews): PNG decode and resize dominate their cold start, so the
+result is saved next to the source and reused while the source is unchanged.
+"""
+
+import json
+import numpy as np
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+
+def load_cached_image(
+    source: Path,
+    cache_path: Path,
+    loader: Callable[[Path], Optional[np.ndarray]],
+    shape: Tuple[int, ...]
+) -> Optional[np.ndarray]:
+    """
+    Return loader(source), cached as cache_path (.npy) with a JSON sidecar.
+
+    The cache is keyed by the source file's name, mtime and size plus the expected
+    shape, so editing or replacing the source image invalidates it automatically.
+    Saving is best effort (the assets dir may be read-only).
+
+    Args:
+        source: Source image file
+        cache_path: Where to keep the .npy cache (sidecar: same name, .json)
+        loader: Decodes and resizes source to a uint8 array of `shape`, or returns
+            None if it can't (None is returned as-is and not cached)
+        shape: Expected array shape; a cached array of any other shape is ignored
+
+    Returns:
+        Writable uint8 array (a fresh in-memory copy, safe to draw into), or None
+    """
+    meta_path = cache_path.with_suffix(".json")
+
+    stat = source.stat()
+    meta = {
+        "source": source.name,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "shape": list(shape),
+    }
+
+    # Cache hit: skip decode + resize (plain np.load: callers mutate the result, so a
+    # memmap would have to be copied in full anyway)
+    try:
+        if json.loads(meta_path.read_text()) == meta:
+            cached = np.load(cache_path)
+            if cached.shape == tuple(shape) and cached.dtype == np.uint8:
+                return cached
+    except (OSError, ValueError):
+        pass
+
+    img = loader(source)
+    if img is None:
+        return None
+
+    try:
+        np.save(cache_path, img)
+        meta_path.write_text(json.dumps(meta))
+    except OSError:
+        pass
+
+    return img
@@ -0,0 +1,24 @@
+"""
+Optional Numba JIT support.
+Numba is not a hard dependency: without it, `njit` is an identity decorator and
+callers should take their NumPy path when NUMBA_AVAILABLE is False. `prange`
+falls back to the builtin range.
+"""
+
+try:
+    import numba
+    from numba import prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    numba = None
+    prange = range
+    NUMBA_AVAILABLE = False
+
+
+def njit(*args, **kwargs):
+    """numba.njit if installed, otherwise a no-op decorator (supports both @njit and @njit(...))."""
+    if NUMBA_AVAILABLE:
+        return numba.njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda fn: fn
@@ -11,10 +11,14 @@ Enterprise-grade implementation with:
 
 import cv2
 import numpy as np
+from itertools import chain
 from pathlib import Path
 from typing import Dict, Tuple, Optional
 from dataclasses import dataclass
 
+from numba_compat import NUMBA_AVAILABLE
+from image_cache import load_cached_image
+from projection import project, project_points
 from sim import SimState
 from world_config import get_world_calibration, WorldCalibration
 
@@ -61,18 +65,37 @@ class ObservationBuilder:
     WORLD_X_RANGE = (-0.4, 0.4)  # Table width
     WORLD_Y_RANGE = (-0.3, 0.3)  # Table depth
 
-    def __init__(self, assets_dir: Path):
+    def __init__(self, assets_dir: Path, output_dtype=PI05_DTYPE, device: Optional[str] = None,
+                 validate: bool = False):
         """
         Initialize observation builder with Marble backgrounds.
 
         Args:
             assets_dir: Path to assets/ directory containing world1/, world2/, world3/
+            output_dtype: np.float32 for [0,1] images (PI0.5 default), or np.uint8 to
+                hand raw [0,255] images downstream and normalize at the consumer
+            device: Torch device (e.g. 'cuda') to assemble images on. Observations are then
+                torch tensors resident on that device. Falls back to the cv2 path if CUDA
+                is unavailable.
+            validate: Run _validate_observation on every build (two full-image reductions per
+                view); off by default for the hot path
         """
         self.assets_dir = Path(assets_dir)
+        self.validate = validate
+
+        self.output_dtype = np.dtype(output_dtype)
+        if self.output_dtype not in (np.dtype(np.float32), np.dtype(np.uint8)):
+            raise ValueError(f"Unsupported output_dtype {self.output_dtype}, expected float32 or uint8")
 
         # Cache for loaded images (avoid repeated disk I/O)
         self._bg_cache: Dict[str, np.ndarray] = {}
 
+        # Background source paths per world, found with a single scan of assets_dir
+        self._bg_paths = self._scan_background_paths()
+
+        # Stacked (exterior, wrist) backgrounds with the world-constant goal marker pre-drawn
+        self._goal_bg_cache: Dict[int, np.ndarray] = {}
+
         # Camera configuration
         self.camera_config = CameraConfig(
             world_bounds=(*self.WORLD_X_RANGE, *self.WORLD_Y_RANGE),
@@ -80,8 +103,49 @@ class ObservationBuilder:
             marker_radius_px=8
         )
 
-        # Pre-allocate output array (avoid allocation every step)
-        self._output_image = np.zeros(self.PI05_IMAGE_SHAPE, dtype=np.uint8)
+        # Pre-allocate drawing canvas and normalized output (avoid allocation every step).
+        # Both views share one stacked (2, 224, 224, 3) buffer: [0] = exterior, [1] = wrist,
+        # so restore and normalization are a single call each and each view stays contiguous.
+        self._work = np.empty((2, *self.PI05_IMAGE_SHAPE), dtype=np.uint8)
+        if self.output_dtype == np.uint8:
+            self._normalized = None  # Canvas is returned directly
+        else:
+            self._normalized = np.empty((2, *self.PI05_IMAGE_SHAPE), dtype=self.PI05_DTYPE)
+
+        # Dirty-rect tracking: which world the canvas holds, and the (y0, y1, x0, x1)
+        # boxes drawn last step (only these need restoring from the background)
+        self._work_world: Optional[int] = None
+        self._dirty_rects = []
+
+        # Pre-rasterized (stamp, mask) pairs for the fixed-radius markers
+        self._stamps = self._build_stamps()
+
+        # Optional GPU assembly path (torch imported lazily: only needed when requested)
+        self._torch = None
+        if device is not None:
+            self._init_gpu(device)
+
+    def _scan_background_paths(self) -> Dict[int, Tuple[Optional[Path], Optional[Path]]]:
+        """
+        Find exterior and wrist images for every worldN/ directory (handles .png/.jpg naming).
+
+        Returns:
+            world_id → (exterior_path, wrist_path); a path is None if no match was found
+        """
+        paths = {}
+        if not self.assets_dir.is_dir():
+            return paths
+
+        for world_dir in self.assets_dir.glob("world*"):
+            suffix = world_dir.name[len("world"):]
+            if not suffix.isdigit() or not world_dir.is_dir():
+                continue
+
+            exterior = next(chain(world_dir.glob("*exterior*.png"), world_dir.glob("*exterior*.jpg")), None)
+            wrist = next(chain(world_dir.glob("*wrist*.png"), world_dir.glob("*wrist*.jpg")), None)
+            paths[int(suffix)] = (exterior, wrist)
+
+        return paths
 
     def load_world_backgrounds(self, world_id: int) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -100,51 +164,80 @@ class ObservationBuilder:
         if cache_key_ext in self._bg_cache and cache_key_wrist in self._bg_cache:
             return self._bg_cache[cache_key_ext], self._bg_cache[cache_key_wrist]
 
-        # Load from disk
+        # Load from disk (source paths resolved once at init)
         world_dir = self.assets_dir / f"world{world_id}"
+        exterior_path, wrist_path = self._bg_paths.get(world_id, (None, None))
 
-        # Find exterior and wrist images (handle different naming conventions)
-        exterior_candidates = list(world_dir.glob("*exterior*.png")) + list(world_dir.glob("*exterior*.jpg"))
-        wrist_candidates = list(world_dir.glob("*wrist*.png")) + list(world_dir.glob("*wrist*.jpg"))
-
-        if not exterior_candidates:
+        if exterior_path is None:
             raise FileNotFoundError(f"No exterior image found in {world_dir}")
-        if not wrist_candidates:
+        if wrist_path is None:
             raise FileNotFoundError(f"No wrist image found in {world_dir}")
 
-        # Load images
-        exterior_path = exterior_candidates[0]
-        wrist_path = wrist_candidates[0]
+        # Load images (from the on-disk .npy cache when it is fresh)
+        exterior_rgb = self._load_background_image(exterior_path, world_dir, "exterior")
+        wrist_rgb = self._load_background_image(wrist_path, world_dir, "wrist")
 
-        exterior_raw = cv2.imread(str(exterior_path))
-        wrist_raw = cv2.imread(str(wrist_path))
+        # Cache for future use
+        self._bg_cache[cache_key_ext] = exterior_rgb
+        self._bg_cache[cache_key_wrist] = wrist_rgb
 
-        if exterior_raw is None:
-            raise ValueError(f"Failed to load {exterior_path}")
-        if wrist_raw is None:
-            raise ValueError(f"Failed to load {wrist_path}")
+        return exterior_rgb, wrist_rgb
 
-        # Resize to PI0.5 input size (224×224)
-        exterior_resized = cv2.resize(
-            exterior_raw,
-            (self.PI05_IMAGE_SIZE, self.PI05_IMAGE_SIZE),
-            interpolation=cv2.INTER_AREA  # INTER_AREA best for downsampling
-        )
-        wrist_resized = cv2.resize(
-            wrist_raw,
-            (self.PI05_IMAGE_SIZE, self.PI05_IMAGE_SIZE),
-            interpolation=cv2.INTER_AREA
-        )
+    def _load_background_image(self, image_path: Path, world_dir: Path, view: str) -> np.ndarray:
+        """
+        Load one background as a 224×224 RGB uint8 array, via a persistent .npy disk cache
+        (see image_cache.load_cached_image).
+        """
+        cache_path = world_dir / f"_cache_{view}_{self.PI05_IMAGE_SIZE}.npy"
+        return load_cached_image(image_path, cache_path, self._decode_background, self.PI05_IMAGE_SHAPE)
+
+    def _decode_background(self, image_path: Path) -> np.ndarray:
+        """Decode one background image and resize it to a 224×224 RGB uint8 array."""
+        raw = cv2.imread(str(image_path))
+        if raw is None:
+            raise ValueError(f"Failed to load {image_path}")
+
+        # Resize to PI0.5 input size (224×224). INTER_AREA only pays off for large
+        # downscales; near-224 sources use INTER_LINEAR, exact-size ones skip it.
+        size = self.PI05_IMAGE_SIZE
+        if raw.shape[:2] == (size, size):
+            resized = raw
+        else:
+            ratio = max(raw.shape[:2]) / size
+            resized = cv2.resize(
+                raw,
+                (size, size),
+                interpolation=cv2.INTER_AREA if ratio > 2 else cv2.INTER_LINEAR
+            )
 
         # Convert BGR → RGB (cv2 loads as BGR, PI0.5 expects RGB)
-        exterior_rgb = cv2.cvtColor(exterior_resized, cv2.COLOR_BGR2RGB)
-        wrist_rgb = cv2.cvtColor(wrist_resized, cv2.COLOR_BGR2RGB)
+        # (channel-reversed view made contiguous so later cv2 draws can write into it)
+        return np.ascontiguousarray(resized[:, :, ::-1])
 
-        # Cache for future use
-        self._bg_cache[cache_key_ext] = exterior_rgb
-        self._bg_cache[cache_key_wrist] = wrist_rgb
+    def _load_goal_backgrounds(self, world_id: int, calibration: WorldCalibration) -> np.ndarray:
+        """
+        Get world backgrounds with the goal marker baked in (drawn once per world, not per step).
 
-        return exterior_rgb, wrist_rgb
+        Returns:
+            Stacked (2, 224, 224, 3) uint8 array: [0] = exterior, [1] = wrist
+        """
+        if world_id in self._goal_bg_cache:
+            return self._goal_bg_cache[world_id]
+
+        stacked = np.stack(self.load_world_backgrounds(world_id))
+
+        # Goal location (green circle, semi-transparent effect via thinner line)
+        for img in stacked:
+            cv2.circle(
+                img,
+                calibration.floor_center_px,
+                self.camera_config.marker_radius_px,
+                self.camera_config.colors['goal'],
+                thickness=3  # Outline only
+            )
+
+        self._goal_bg_cache[world_id] = stacked
+        return stacked
 
     def world_to_pixel(self, world_pos: np.ndarray, calibration: WorldCalibration) -> Tuple[int, int]:
         """
@@ -157,21 +250,159 @@ class ObservationBuilder:
         Returns:
             (pixel_x, pixel_y) in image coordinates [0, 224)
         """
-        x, y, _ = world_pos  # Ignore Z (top-down projection)
+        if NUMBA_AVAILABLE:
+            x, y, _ = world_pos  # Ignore Z (top-down projection)
+            cx, cy = calibration.table_center_px
+            return project(float(x), float(y), cx, cy, calibration.pixels_per_meter,
+                           self.PI05_IMAGE_SIZE)
+
+        pixel_x, pixel_y = self.world_to_pixels(np.asarray(world_pos)[None], calibration)[0].tolist()
+        return (pixel_x, pixel_y)
+
+    def world_to_pixels(self, points: np.ndarray, calibration: WorldCalibration) -> np.ndarray:
+        """
+        Vectorized world_to_pixel for N points at once.
+
+        Args:
+            points: (N, 3) array of [x, y, z] world coordinates
+            calibration: World-specific calibration parameters
+
+        Returns:
+            (N, 2) int32 array of (pixel_x, pixel_y) in image coordinates [0, 224)
+        """
+        # One projection implementation (projection.project_points, NumPy
+        # world_config.project_batch without numba), looked up by world_id
+        world_ids = np.full(len(points), calibration.world_id, dtype=np.int64)
+        return project_points(world_ids, points, self.PI05_IMAGE_SIZE)
 
-        # Convert world meters to pixel offset from table center
-        offset_x_px = int(x * calibration.pixels_per_meter)
-        offset_y_px = int(-y * calibration.pixels_per_meter)  # Negative Y (image Y increases downward)
+    def _init_gpu(self, device: str):
+        """Set up device-resident state for GPU image assembly (no-op if CUDA is unavailable)."""
+        import torch
 
-        # Add offset to table center
-        pixel_x = calibration.table_center_px[0] + offset_x_px
-        pixel_y = calibration.table_center_px[1] + offset_y_px
+        if torch.device(device).type == 'cuda' and not torch.cuda.is_available():
+            print(f"⚠ CUDA not available, using cv2 observation path instead of {device}")
+            return
 
-        # Clamp to valid image bounds
-        pixel_x = np.clip(pixel_x, 0, self.PI05_IMAGE_SIZE - 1)
-        pixel_y = np.clip(pixel_y, 0, self.PI05_IMAGE_SIZE - 1)
+        self._torch = torch
+        self.device = torch.device(device)
 
-        return (pixel_x, pixel_y)
+        # Device-resident stacked backgrounds, keyed by world_id
+        self._gpu_bg_cache = {}
+
+        # Pixel coordinate grids, built once; per-step marker masks are a broadcast compare
+        coords = torch.arange(self.PI05_IMAGE_SIZE, device=self.device, dtype=torch.int32)
+        self._gpu_yy, self._gpu_xx = torch.meshgrid(coords, coords, indexing='ij')
+
+        self._gpu_colors = {
+            name: torch.tensor(color, dtype=torch.uint8, device=self.device)
+            for name, color in self.camera_config.colors.items()
+        }
+        self._gpu_colors['border'] = torch.zeros(3, dtype=torch.uint8, device=self.device)
+
+    def _assemble_gpu(self, world_id: int, stacked_bg: np.ndarray,
+                      gripper_px: Tuple[int, int], marker_px: Tuple[int, int]):
+        """Draw markers and normalize both views on the GPU; returns (exterior, wrist) tensors."""
+        torch = self._torch
+
+        bg = self._gpu_bg_cache.get(world_id)
+        if bg is None:
+            bg = torch.as_tensor(stacked_bg, device=self.device)
+            self._gpu_bg_cache[world_id] = bg
+
+        r = self.camera_config.marker_radius_px
+        img = bg.clone()
+
+        # Squared distance of every pixel to each marker center
+        d2_gripper = (self._gpu_xx - gripper_px[0]) ** 2 + (self._gpu_yy - gripper_px[1]) ** 2
+        d2_marker = (self._gpu_xx - marker_px[0]) ** 2 + (self._gpu_yy - marker_px[1]) ** 2
+
+        # Gripper disc, marker disc, then a ~2px black ring around the marker
+        img[:, d2_gripper <= r * r] = self._gpu_colors['gripper']
+        img[:, d2_marker <= r * r] = self._gpu_colors['marker']
+        img[:, ((r - 1) ** 2 <= d2_marker) & (d2_marker <= (r + 1) ** 2)] = self._gpu_colors['border']
+
+        if self.output_dtype == np.uint8:
+            return img[0], img[1]
+
+        normalized = img.to(torch.float32).mul_(1.0 / 255.0)
+        return normalized[0], normalized[1]
+
+    def _assemble_cpu(self, world_id: int, stacked_bg: np.ndarray,
+                      gripper_px: Tuple[int, int], marker_px: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Draw markers and normalize both views with cv2/NumPy; returns (exterior, wrist) arrays."""
+        # Restore working canvases from the cache (avoid modifying cached images):
+        # full copy on world change, otherwise only the boxes drawn over last step
+        if self._work_world != world_id:
+            np.copyto(self._work, stacked_bg)
+            self._work_world = world_id
+        else:
+            for y0, y1, x0, x1 in self._dirty_rects:
+                self._work[:, y0:y1, x0:x1] = stacked_bg[:, y0:y1, x0:x1]
+        exterior_img, wrist_img = self._work
+
+        self._dirty_rects = [self._marker_rect(gripper_px), self._marker_rect(marker_px)]
+
+        # Gripper disc, then marker disc with its black border (one masked copy each,
+        # broadcast over both views)
+        self._blit_stamp(gripper_px, self._dirty_rects[0], *self._stamps['gripper'])
+        self._blit_stamp(marker_px, self._dirty_rects[1], *self._stamps['marker'])
+
+        if self.output_dtype == np.uint8:
+            # Raw uint8 [0,255]; consumer normalizes (4× fewer bytes, no per-step cast)
+            exterior_normalized, wrist_normalized = exterior_img, wrist_img
+        else:
+            # Normalize both views to [0, 1] float32 (PI0.5 requirement), cast + scale in one pass
+            scale = self.PI05_DTYPE(1.0 / 255.0)
+            np.multiply(self._work, scale, out=self._normalized, dtype=self.PI05_DTYPE)
+            exterior_normalized, wrist_normalized = self._normalized
+
+        return exterior_normalized, wrist_normalized
+
+    def _build_stamps(self) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Rasterize each marker once with cv2 into a small (2p+1, 2p+1, 3) stamp plus a
+        (2p+1, 2p+1, 1) bool mask (p = radius + 3, same box as _marker_rect), so per-step
+        drawing is a masked np.copyto instead of cv2's rasterizer.
+        """
+        r = self.camera_config.marker_radius_px
+        pad = r + 3
+        center = (pad, pad)
+        side = 2 * pad + 1
+
+        def stamp(*circles):
+            img = np.zeros((side, side, 3), dtype=np.uint8)
+            mask = np.zeros((side, side), dtype=np.uint8)
+            for color, thickness in circles:
+                cv2.circle(img, center, r, color, thickness=thickness)
+                cv2.circle(mask, center, r, 255, thickness=thickness)
+            return img, (mask > 0)[:, :, None]
+
+        colors = self.camera_config.colors
+        return {
+            # Gripper (red circle)
+            'gripper': stamp((colors['gripper'], -1)),
+            # Marker object (red circle) with black border for visibility
+            'marker': stamp((colors['marker'], -1), ((0, 0, 0), 2)),
+        }
+
+    def _blit_stamp(self, center_px: Tuple[int, int], rect: Tuple[int, int, int, int],
+                    stamp: np.ndarray, mask: np.ndarray):
+        """Copy a marker stamp onto both working views, clipped to the image by rect."""
+        y0, y1, x0, x1 = rect
+        pad = self.camera_config.marker_radius_px + 3
+        sy0 = y0 - (center_px[1] - pad)
+        sx0 = x0 - (center_px[0] - pad)
+        sy1 = sy0 + (y1 - y0)
+        sx1 = sx0 + (x1 - x0)
+        np.copyto(self._work[:, y0:y1, x0:x1], stamp[sy0:sy1, sx0:sx1],
+                  where=mask[sy0:sy1, sx0:sx1])
+
+    def _marker_rect(self, center_px: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        """Bounding box (y0, y1, x0, x1) covering a marker circle plus its border, clipped to the image."""
+        pad = self.camera_config.marker_radius_px + 3
+        x, y = center_px
+        size = self.PI05_IMAGE_SIZE
+        return (max(y - pad, 0), min(y + pad + 1, size), max(x - pad, 0), min(x + pad + 1, size))
 
     def build_observation(
         self,
@@ -189,66 +420,32 @@ class ObservationBuilder:
 
         Returns:
             Dictionary with keys required by PI0.5:
-                - "observation/exterior_image_1_left": (224, 224, 3) float32 [0,1]
-                - "observation/wrist_image_left": (224, 224, 3) float32 [0,1]
+                - "observation/exterior_image_1_left": (224, 224, 3) float32 [0,1] (uint8 [0,255] if output_dtype=uint8)
+                - "observation/wrist_image_left": (224, 224, 3) float32 [0,1] (uint8 [0,255] if output_dtype=uint8)
                 - "prompt": str
+
+            Image arrays are buffers owned by the builder and are overwritten by
+            the next call; copy them if they must outlive the current step. With a
+            CUDA device they are torch tensors on that device instead.
         """
         # Get world-specific calibration
         calibration = get_world_calibration(world_id)
 
-        # Load backgrounds (cached after first load)
-        exterior_bg, wrist_bg = self.load_world_backgrounds(world_id)
-
-        # Create working copies (avoid modifying cached images)
-        exterior_img = exterior_bg.copy()
-        wrist_img = wrist_bg.copy()
+        # Load backgrounds with goal marker pre-drawn (cached after first load)
+        stacked_bg = self._load_goal_backgrounds(world_id, calibration)
 
-        # Convert 3D positions to 2D pixels using calibrated projection
-        gripper_px = self.world_to_pixel(state.gripper_pos, calibration)
-        marker_px = self.world_to_pixel(state.marker_pos, calibration)
+        # Convert 3D positions to 2D pixels using calibrated projection (one vectorized call)
+        points = np.stack((state.gripper_pos, state.marker_pos))
+        gripper_px, marker_px = map(tuple, self.world_to_pixels(points, calibration).tolist())
 
-        # Goal is floor position (use calibrated floor center)
-        goal_px = calibration.floor_center_px
-
-        # Draw visual markers on both views
-        for img in [exterior_img, wrist_img]:
-            # Gripper (red circle)
-            cv2.circle(
-                img,
-                gripper_px,
-                self.camera_config.marker_radius_px,
-                self.camera_config.colors['gripper'],
-                thickness=-1  # Filled circle
+        if self._torch is not None:
+            exterior_normalized, wrist_normalized = self._assemble_gpu(
+                world_id, stacked_bg, gripper_px, marker_px
             )
-
-            # Marker object (red circle with black border for visibility)
-            cv2.circle(
-                img,
-                marker_px,
-                self.camera_config.marker_radius_px,
-                self.camera_config.colors['marker'],
-                thickness=-1
+        else:
+            exterior_normalized, wrist_normalized = self._assemble_cpu(
+                world_id, stacked_bg, gripper_px, marker_px
             )
-            cv2.circle(
-                img,
-                marker_px,
-                self.camera_config.marker_radius_px,
-                (0, 0, 0),  # Black border
-                thickness=2
-            )
-
-            # Goal location (green circle, semi-transparent effect via thinner line)
-            cv2.circle(
-                img,
-                goal_px,
-                self.camera_config.marker_radius_px,
-                self.camera_config.colors['goal'],
-                thickness=3  # Outline only
-            )
-
-        # Normalize to [0, 1] float32 (PI0.5 requirement)
-        exterior_normalized = exterior_img.astype(self.PI05_DTYPE) / 255.0
-        wrist_normalized = wrist_img.astype(self.PI05_DTYPE) / 255.0
 
         # Build PI0.5 observation (exact format from openpi/DROID examples)
         observation = {
@@ -257,8 +454,9 @@ class ObservationBuilder:
             "prompt": task_prompt
         }
 
-        # Validate output format (safety check)
-        self._validate_observation(observation)
+        # Validate output format (safety check, opt-in: not needed on the hot path)
+        if self.validate:
+            self._validate_observation(observation)
 
         return observation
 
@@ -277,10 +475,12 @@ class ObservationBuilder:
             if img.shape != self.PI05_IMAGE_SHAPE:
                 raise ValueError(f"{img_key} has shape {img.shape}, expected {self.PI05_IMAGE_SHAPE}")
 
-            if img.dtype != self.PI05_DTYPE:
-                raise ValueError(f"{img_key} has dtype {img.dtype}, expected {self.PI05_DTYPE}")
+            # Compare by name so torch tensors from the GPU path validate too
+            if str(img.dtype).replace('torch.', '') != self.output_dtype.name:
+                raise ValueError(f"{img_key} has dtype {img.dtype}, expected {self.output_dtype}")
 
-            if img.min() < 0.0 or img.max() > 1.0:
+            # uint8 images are in [0,255] by construction
+            if self.output_dtype != np.uint8 and (img.min() < 0.0 or img.max() > 1.0):
                 raise ValueError(f"{img_key} has values outside [0,1] range")
 
         # Validate prompt
@@ -298,9 +498,14 @@ class ObservationBuilder:
         """
         key = f"observation/{view}_image_1_left" if view == "exterior" else "observation/wrist_image_left"
         img_normalized = obs[key]
+        if not isinstance(img_normalized, np.ndarray):
+            img_normalized = img_normalized.cpu().numpy()  # Tensor from the GPU path
 
         # Convert back to uint8 for saving
-        img_uint8 = (img_normalized * 255).astype(np.uint8)
+        if img_normalized.dtype == np.uint8:
+            img_uint8 = img_normalized
+        else:
+            img_uint8 = (img_normalized * 255).astype(np.uint8)
 
         # Convert RGB → BGR for cv2.imwrite
         img_bgr = cv2.cvtColor(img_uint8, cv2.COLOR_RGB2BGR)
@@ -324,7 +529,7 @@ if __name__ == "__main__":
     # Get correct assets path (backend/ → sisyphus/ → assets/)
     script_dir = Path(__file__).parent
     assets_dir = script_dir.parent / "assets"
-    obs_builder = ObservationBuilder(assets_dir=assets_dir)
+    obs_builder = ObservationBuilder(assets_dir=assets_dir, validate=True)
     print("✓ Components initialized")
 
     # Test world loading
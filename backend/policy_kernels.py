@@ -0,0 +1,38 @@
+"""
+Numba kernels for TransformerPolicy input preparation.
+
+Kept free of torch so build_kernels.py can compile them without importing the
+policy. `pad_and_normalize` is the AOT-built kernel from sisyphus_kernels when
+present, otherwise the @njit one, or None without numba (callers then take
+their NumPy path).
+"""
+
+import numpy as np
+
+from numba_compat import njit, prange, NUMBA_AVAILABLE
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _pad_and_normalize_nb(objects, mean, std, feat_out, mask_out):
+    """Normalize n object rows into feat_out[:n], zero the padding rows, and set the mask."""
+    n = objects.shape[0]
+    for i in prange(feat_out.shape[0]):
+        if i < n:
+            for f in range(feat_out.shape[1]):
+                feat_out[i, f] = (objects[i, f] - mean[f]) / std[f]
+            mask_out[i] = True
+        else:
+            for f in range(feat_out.shape[1]):
+                feat_out[i, f] = 0.0
+            mask_out[i] = False
+
+
+try:
+    from sisyphus_kernels import pad_and_normalize  # Optional: AOT build, see build_kernels.py
+except ImportError:
+    pad_and_normalize = _pad_and_normalize_nb if NUMBA_AVAILABLE else None
+
+if pad_and_normalize is _pad_and_normalize_nb:
+    # Warm the JIT at import so the first rollout step doesn't pay compile latency
+    _pad_and_normalize_nb(np.zeros((1, 1), np.float32), np.zeros(1, np.float32), np.ones(1, np.float32),
+                          np.empty((2, 1), np.float32), np.empty(2, np.bool_))
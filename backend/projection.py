@@ -0,0 +1,70 @@
+"""
+JIT-compiled physics → pixel projection.
+
+Scalar and batched kernels for the top-down calibrated projection used by the
+observation builder (pixel = table center + truncate(±coord × pixels_per_meter),
+clamped to the image). Calibration is passed as plain int/float arrays taken
+from world_config.CALIB, since numba kernels can't take the dataclass.
+
+`project` comes from the AOT-built sisyphus_kernels extension when it has been
+built (python build_kernels.py), skipping JIT compile at startup.
+"""
+
+import numpy as np
+
+from numba_compat import njit, NUMBA_AVAILABLE
+from world_config import CALIB, project_batch
+
+# Per-world calibration columns as contiguous arrays indexed by world_id
+CALIB_CX = np.ascontiguousarray(CALIB['cx'], dtype=np.int64)
+CALIB_CY = np.ascontiguousarray(CALIB['cy'], dtype=np.int64)
+CALIB_PPM = np.ascontiguousarray(CALIB['ppm'], dtype=np.float64)
+
+
+@njit(cache=True, fastmath=True)
+def _project_nb(x, y, cx, cy, ppm, size):
+    """Scalar world → pixel projection with clamping to [0, size)."""
+    px = cx + int(x * ppm)
+    py = cy + int(-y * ppm)  # Image Y increases downward
+    return max(0, min(size - 1, px)), max(0, min(size - 1, py))
+
+
+@njit(cache=True, fastmath=True)
+def _project_many_nb(world_ids, xyz, cx, cy, ppm, size, out):
+    for i in range(xyz.shape[0]):
+        w = world_ids[i]
+        out[i, 0], out[i, 1] = _project_nb(xyz[i, 0], xyz[i, 1], cx[w], cy[w], ppm[w], size)
+    return out
+
+
+try:
+    from sisyphus_kernels import project  # Optional: AOT build, see build_kernels.py
+    _PROJECT_AOT = True
+except ImportError:
+    project = _project_nb
+    _PROJECT_AOT = False
+
+
+def project_points(world_ids: np.ndarray, xyz: np.ndarray, image_size: int = 224) -> np.ndarray:
+    """
+    Project N physics points to pixels, each with its own world's calibration.
+
+    Same result as world_config.project_batch, which is used when numba is unavailable.
+
+    Returns:
+        (N, 2) int32 array of (pixel_x, pixel_y)
+    """
+    if not NUMBA_AVAILABLE:
+        return project_batch(world_ids, xyz, image_size)
+
+    world_ids = np.ascontiguousarray(world_ids, dtype=np.int64)
+    xyz = np.ascontiguousarray(xyz, dtype=np.float64)
+    out = np.empty((xyz.shape[0], 2), dtype=np.int32)
+    return _project_many_nb(world_ids, xyz, CALIB_CX, CALIB_CY, CALIB_PPM, image_size, out)
+
+
+if NUMBA_AVAILABLE:
+    # Warm the JIT at import so the first env step doesn't pay compile latency
+    if not _PROJECT_AOT:
+        project(0.0, 0.0, 0, 0, 1.0, 1)
+    project_points(np.ones(1, dtype=np.int64), np.zeros((1, 3)))
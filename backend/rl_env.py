@@ -14,7 +14,16 @@ import gymnasium as gym
 import numpy as np
 import websocket
 import json
-from typing import Tuple, Dict, Any, Optional
+from typing import Tuple, Dict, Any, List, Optional
+
+try:
+    import orjson  # Optional: faster JSON decode of simulation responses
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Fixed-schema step command, formatted directly (inputs are numeric, no escaping needed)
+_STEP_JSON = '{{"type":"step","action":{{"move_delta":[{!r},{!r},{!r}],"grasp_id":{:d}}}}}'
 
 
 class DeskCleaningEnv(gym.Env):
@@ -25,7 +34,8 @@ class DeskCleaningEnv(gym.Env):
         - Object positions: n × (x, y, z, vx, vy, vz, type_onehot[5], group_onehot[3])
         - Gripper position: (x, y, z)
         - Desk bounds: (minX, maxX, minY, maxY, minZ, maxZ)
-        Total: Variable size (depends on n objects)
+        Total: Variable size (depends on n objects), or fixed when max_objects is set
+            (object rows zero-padded to max_objects, gripper last)
 
     Action Space:
         - Continuous: move_delta (Δx, Δy, Δz) ∈ [-0.5, 0.5]³
@@ -41,12 +51,25 @@ class DeskCleaningEnv(gym.Env):
         - -1: Per timestep
     """
 
+    # Per-object feature layout and one-hot lookup tables (last row = unknown, all zeros)
+    OBJECT_FEATURES = 14
+    _TYPE_IDX = {'pen': 0, 'marker': 1, 'book': 2, 'crumpled_paper': 3, 'soda_can': 4}
+    _GROUP_IDX = {'utensils': 0, 'books': 1, 'trash': 2}
+    _TYPE_ONEHOT = np.vstack([np.eye(5, dtype=np.float32), np.zeros(5, dtype=np.float32)])
+    _GROUP_ONEHOT = np.vstack([np.eye(3, dtype=np.float32), np.zeros(3, dtype=np.float32)])
+
+    # Seconds to wait for the connection and the protocol handshake reply
+    HANDSHAKE_TIMEOUT = 5.0
+
     def __init__(
         self,
         world_id: int = 2,
         ws_url: str = 'ws://localhost:5173',
         max_steps: int = 500,
-        auto_detect_table: bool = True
+        auto_detect_table: bool = True,
+        protocol: str = 'json',
+        obs_dtype=np.float32,
+        max_objects: Optional[int] = None
     ):
         """
         Initialize RL environment.
@@ -56,36 +79,128 @@ class DeskCleaningEnv(gym.Env):
             ws_url: WebSocket URL for JS simulation
             max_steps: Maximum timesteps per episode
             auto_detect_table: Use automatic table detection
+            protocol: Wire format, 'json' or 'msgpack' (binary frames, smaller and faster
+                to encode/decode; negotiated on connect, falls back to 'json')
+            obs_dtype: np.float32 (default) or np.float16 for half-size observations
+                (one-hots stay exact; positions/velocities keep ~3 significant digits);
+                cast back to float32 on the model device if the policy needs it
+            max_objects: Pad observations to this many object rows and declare fixed
+                observation/action spaces (required by vectorized wrappers such as
+                SB3's SubprocVecEnv); None keeps variable-size observations
         """
         super().__init__()
 
+        self.obs_dtype = np.dtype(obs_dtype)
+        if self.obs_dtype not in (np.dtype(np.float32), np.dtype(np.float16)):
+            raise ValueError(f"Unsupported obs_dtype {self.obs_dtype}, expected float32 or float16")
+
+        if protocol not in ('json', 'msgpack'):
+            raise ValueError(f"Unknown protocol: {protocol}. Expected 'json' or 'msgpack'")
+        self.requested_protocol = protocol
+        self.protocol = 'json'
+
         self.world_id = world_id
         self.ws_url = ws_url
         self.max_steps = max_steps
         self.auto_detect = auto_detect_table
+        self.max_objects = max_objects
 
         # Connect to JS simulation
         self.ws: Optional[websocket.WebSocket] = None
         self._connect()
 
-        # Spaces (will be set after first reset)
-        self.observation_space = None
-        self.action_space = None
+        # Spaces: fixed when observations are padded to max_objects, otherwise they
+        # depend on the object count of the loaded scene
+        if max_objects is not None:
+            obs_size = max_objects * self.OBJECT_FEATURES + 3
+            self.observation_space = gym.spaces.Box(
+                -np.inf, np.inf, shape=(obs_size,), dtype=self.obs_dtype
+            )
+            self.action_space = gym.spaces.Box(
+                low=np.array([-0.5, -0.5, -0.5, 0.0], dtype=np.float32),
+                high=np.array([0.5, 0.5, 0.5, max_objects], dtype=np.float32),
+                dtype=np.float32
+            )
+        else:
+            self.observation_space = None
+            self.action_space = None
 
         # Episode tracking
         self.episode = 0
         self.timestep = 0
         self.total_reward = 0.0
 
+        # Reused observation buffer (grown on demand, or fixed-size when padded;
+        # see _parse_state)
+        if max_objects is not None:
+            self._state_buf = np.zeros(max_objects * self.OBJECT_FEATURES + 3, dtype=self.obs_dtype)
+        else:
+            self._state_buf = np.empty(0, dtype=self.obs_dtype)
+
     def _connect(self):
         """Establish WebSocket connection to JS simulation."""
         try:
-            self.ws = websocket.create_connection(self.ws_url)
+            self.ws = websocket.create_connection(self.ws_url, timeout=self.HANDSHAKE_TIMEOUT)
             print(f"✓ Connected to JS simulation at {self.ws_url}")
         except Exception as e:
             print(f"⚠ WebSocket connection failed: {e}")
             print("  Start simulation with: cd spark-physics && npm run dev")
             self.ws = None
+            return
+
+        self.protocol = 'json'
+        try:
+            if self.requested_protocol == 'msgpack':
+                self._negotiate_msgpack()
+        finally:
+            if self.ws is not None:
+                self.ws.settimeout(None)  # Back to blocking mode for reset/step
+
+    def _negotiate_msgpack(self):
+        """Ask the simulation to switch to msgpack framing (handshake itself is JSON)."""
+        try:
+            import msgpack
+        except ImportError:
+            print("⚠ msgpack not installed, using JSON protocol (pip install msgpack)")
+            return
+
+        # Bounded wait (socket timeout set in _connect): a simulation that ignores
+        # set_protocol never answers
+        self.ws.send(json.dumps({'type': 'set_protocol', 'protocol': 'msgpack'}))
+        try:
+            ack = json.loads(self.ws.recv())
+        except websocket.WebSocketTimeoutException:
+            # A reply arriving late would be read as the first reset response: drop
+            # this connection and stay on JSON over a fresh one
+            print("⚠ No protocol handshake reply, reconnecting with JSON protocol")
+            self.ws.close()
+            try:
+                self.ws = websocket.create_connection(self.ws_url, timeout=self.HANDSHAKE_TIMEOUT)
+            except Exception as e:
+                print(f"⚠ WebSocket reconnection failed: {e}")
+                self.ws = None
+            return
+        except ValueError:
+            ack = {}
+
+        if ack.get('protocol') == 'msgpack':
+            self._msgpack = msgpack
+            self.protocol = 'msgpack'
+        else:
+            print("⚠ Simulation does not support msgpack, using JSON protocol")
+
+    def _send(self, cmd: Dict):
+        """Encode and send a command using the negotiated protocol."""
+        if self.protocol == 'msgpack':
+            self.ws.send_binary(self._msgpack.packb(cmd, use_bin_type=True))
+        else:
+            self.ws.send(json.dumps(cmd))
+
+    def _recv(self) -> Any:
+        """Receive and decode one message using the negotiated protocol."""
+        if self.protocol == 'msgpack':
+            return self._msgpack.unpackb(self.ws.recv(), raw=False)
+        return _json_loads(self.ws.recv())
 
     def reset(
         self,
@@ -111,8 +226,8 @@ class DeskCleaningEnv(gym.Env):
             'auto_detect': self.auto_detect
         }
 
-        self.ws.send(json.dumps(cmd))
-        response = json.loads(self.ws.recv())
+        self._send(cmd)
+        response = self._recv()
 
         self.timestep = 0
         self.total_reward = 0.0
@@ -137,20 +252,81 @@ class DeskCleaningEnv(gym.Env):
             truncated: Episode timed out
             info: Metadata
         """
+        # NaN/inf would be formatted as bare tokens, which are not valid JSON
+        if not np.isfinite(action[:3]).all():
+            raise ValueError(f"Non-finite move_delta in action: {action[:3]}")
+
         self.timestep += 1
 
-        # Send action to JS
+        # Send action to JS (JSON payload formatted from a template, no dict + encoder pass)
+        dx, dy, dz, grasp_id = action[:4].tolist()
+        if self.protocol == 'json':
+            self.ws.send(_STEP_JSON.format(dx, dy, dz, int(grasp_id)))
+        else:
+            self._send({
+                'type': 'step',
+                'action': {'move_delta': [dx, dy, dz], 'grasp_id': int(grasp_id)}
+            })
+        response = self._recv()
+
+        return self._unpack_step_response(response)
+
+    def step_batch(
+        self,
+        actions: np.ndarray
+    ) -> Tuple[List[np.ndarray], np.ndarray, np.ndarray, np.ndarray, List[Dict]]:
+        """
+        Execute K actions with a single WebSocket round trip (for rollout collection).
+
+        The simulation applies the actions in order and stops early if an episode ends,
+        so fewer than K results may be returned.
+
+        Args:
+            actions: (K, 4) array of [move_dx, move_dy, move_dz, grasp_id]
+
+        Returns:
+            states: List of next-state observations
+            rewards: (k,) rewards
+            terminated: (k,) bool flags
+            truncated: (k,) bool flags
+            infos: List of metadata dicts
+        """
+        # Same guard as step(): json.dumps would emit NaN/Infinity, which is not valid JSON
+        actions = np.asarray(actions)
+        if not np.isfinite(actions[:, :3]).all():
+            raise ValueError("Non-finite move_delta in step_batch actions")
+
         cmd = {
-            'type': 'step',
-            'action': {
-                'move_delta': action[:3].tolist(),
-                'grasp_id': int(action[3])
-            }
+            'type': 'step_batch',
+            'actions': [
+                {'move_delta': action[:3].tolist(), 'grasp_id': int(action[3])}
+                for action in actions
+            ]
         }
 
-        self.ws.send(json.dumps(cmd))
-        response = json.loads(self.ws.recv())
-
+        self._send(cmd)
+        responses = self._recv()
+
+        states, rewards, terminated, truncated, infos = [], [], [], [], []
+        for response in responses:
+            self.timestep += 1
+            state, reward, term, trunc, info = self._unpack_step_response(response)
+            states.append(state.copy())  # _parse_state reuses its buffer
+            rewards.append(reward)
+            terminated.append(term)
+            truncated.append(trunc)
+            infos.append(info)
+
+        return (
+            states,
+            np.asarray(rewards, dtype=np.float32),
+            np.asarray(terminated, dtype=bool),
+            np.asarray(truncated, dtype=bool),
+            infos
+        )
+
+    def _unpack_step_response(self, response: Dict) -> Tuple[np.ndarray, float, bool, bool, Dict]:
+        """Convert one JS step response into (state, reward, terminated, truncated, info)."""
         state = self._parse_state(response['state'])
         reward = response['reward']
         done = response['done']
@@ -167,37 +343,41 @@ class DeskCleaningEnv(gym.Env):
         """
         Convert JS state dictionary to numpy observation.
 
+        The result is a view into a buffer reused on every call; copy it if it
+        must outlive the next reset/step.
+
         Returns:
-            Flattened state vector
+            Flattened state vector (object rows zero-padded to max_objects if set)
         """
         objects = state_dict['objects']
         gripper = state_dict['gripper']
 
-        # Flatten object states
-        obj_features = []
-        for obj in objects:
-            pos = [obj['position']['x'], obj['position']['y'], obj['position']['z']]
-            vel = [obj['velocity']['x'], obj['velocity']['y'], obj['velocity']['z']]
-
-            # One-hot encode type (5 types)
-            type_onehot = [0] * 5
-            type_map = {'pen': 0, 'marker': 1, 'book': 2, 'crumpled_paper': 3, 'soda_can': 4}
-            if obj['type'] in type_map:
-                type_onehot[type_map[obj['type']]] = 1
-
-            # One-hot encode group (3 groups)
-            group_onehot = [0] * 3
-            group_map = {'utensils': 0, 'books': 1, 'trash': 2}
-            if obj['group'] in group_map:
-                group_onehot[group_map[obj['group']]] = 1
-
-            obj_features.extend(pos + vel + type_onehot + group_onehot)
+        n_obj = len(objects)
+        if self.max_objects is not None:
+            if n_obj > self.max_objects:
+                raise ValueError(f"Scene has {n_obj} objects, more than max_objects={self.max_objects}")
+            state_vec = self._state_buf
+            state_vec[n_obj * self.OBJECT_FEATURES:-3] = 0.0  # Padding rows
+        else:
+            need = n_obj * self.OBJECT_FEATURES + 3
+            if need > self._state_buf.size:
+                self._state_buf = np.empty(need * 2, dtype=self.obs_dtype)
+            state_vec = self._state_buf[:need]
+
+        # Object rows: pos(3) + vel(3) + type_onehot(5) + group_onehot(3)
+        obj_features = state_vec[:n_obj * self.OBJECT_FEATURES].reshape(n_obj, self.OBJECT_FEATURES)
+        for i, obj in enumerate(objects):
+            pos = obj['position']
+            vel = obj['velocity']
+            row = obj_features[i]
+            row[0:3] = (pos['x'], pos['y'], pos['z'])
+            row[3:6] = (vel['x'], vel['y'], vel['z'])
+            # Unknown type/group maps to the all-zero row
+            row[6:11] = self._TYPE_ONEHOT[self._TYPE_IDX.get(obj['type'], -1)]
+            row[11:14] = self._GROUP_ONEHOT[self._GROUP_IDX.get(obj['group'], -1)]
 
         # Gripper features
-        gripper_features = [gripper['x'], gripper['y'], gripper['z']]
-
-        # Combine
-        state_vec = np.array(obj_features + gripper_features, dtype=np.float32)
+        state_vec[-3:] = (gripper['x'], gripper['y'], gripper['z'])
 
         return state_vec
 
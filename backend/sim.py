@@ -3,16 +3,61 @@ Physics simulation for pick-and-place task using PyBullet.
 Enterprise-grade implementation with robust error handling and optimized performance.
 """
 
+import math
 import pybullet as p
 import numpy as np
 from typing import Dict, Tuple, Optional, List
 from dataclasses import dataclass
-from coordinate_mapper import CoordinateMapper
-
-
-@dataclass
+from coordinate_mapper import get_mapper
+from numba_compat import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True)
+def _clamp_nb(pos, lo, hi):
+    """Clamp a 3-vector into [lo, hi] in place (JIT-compiled when numba is installed)."""
+    for i in range(3):
+        if pos[i] < lo[i]:
+            pos[i] = lo[i]
+        elif pos[i] > hi[i]:
+            pos[i] = hi[i]
+
+
+@njit(cache=True)
+def _nearest_within_nb(origin, points, threshold_sq):
+    """Index of the row of points nearest to origin if within sqrt(threshold_sq), else -1."""
+    best = -1
+    best_sq = threshold_sq
+    for i in range(points.shape[0]):
+        dx = points[i, 0] - origin[0]
+        dy = points[i, 1] - origin[1]
+        dz = points[i, 2] - origin[2]
+        d_sq = dx * dx + dy * dy + dz * dz
+        if d_sq < best_sq:
+            best = i
+            best_sq = d_sq
+    return best
+
+
+@njit(cache=True)
+def _steer_toward_nb(origin, target, speed):
+    """XY step of length speed from origin toward target, as (dx, dy)."""
+    dx = target[0] - origin[0]
+    dy = target[1] - origin[1]
+    n = math.sqrt(dx * dx + dy * dy) + 1e-6
+    return dx / n * speed, dy / n * speed
+
+
+if NUMBA_AVAILABLE:
+    # Warm the JIT at import (loads from the on-disk cache after the first run) so the
+    # first reset/step doesn't pay compile latency
+    _clamp_nb(np.zeros(3), np.zeros(3), np.ones(3))
+    _nearest_within_nb(np.zeros(3), np.zeros((3, 3)), 1.0)
+    _steer_toward_nb(np.zeros(3), np.ones(3), 1.0)
+
+
+@dataclass(slots=True)
 class SimState:
-    """Immutable state snapshot from physics simulation."""
+    """Immutable state snapshot from physics simulation (slotted: no per-instance __dict__)."""
     gripper_pos: np.ndarray          # (3,) [x, y, z]
     object_to_pickup_pos: np.ndarray # (3,) [x, y, z] - main object
     obstacle_1_pos: np.ndarray       # (3,) [x, y, z] - clutter
@@ -51,25 +96,80 @@ class PickPlaceSimulation:
 
     # Grasp parameters
     GRASP_DISTANCE_THRESHOLD = 0.06  # Slightly larger than marker radius for robustness
+    GRASP_DISTANCE_THRESHOLD_SQ = GRASP_DISTANCE_THRESHOLD ** 2  # Compare squared distances (no sqrt)
     MARKER_MASS = 0.05  # 50g marker
 
     # Performance optimization
     PHYSICS_TIMESTEP = 1.0 / 240.0  # High frequency for stability
     NUM_SUBSTEPS = 4  # Multiple substeps per step() call for accuracy
-
-    def __init__(self, headless: bool = True):
+    NUM_SOLVER_ITERATIONS = 10  # Constraint solver iterations per substep (PyBullet default 50)
+
+    # Grasped object origin relative to the gripper origin once the constraint has
+    # converged: the JOINT_FIXED parent frame set up when grasping in step() holds the
+    # object below the gripper
+    GRASPED_OFFSET = np.array([0.0, 0.0, -(GRIPPER_RADIUS + MARKER_HEIGHT / 2)])
+    GRASPED_OFFSET.flags.writeable = False
+    GRASP_SETTLED_TOL_SQ = 0.001 ** 2  # Held object counts as snapped within 1mm of the offset
+
+    # Gripper-object distance beyond which the gripper cannot touch a marker (gripper
+    # sphere + marker bounding sphere + 1cm margin); used by the idle-scene fast path
+    IDLE_CLEARANCE_SQ = (GRIPPER_RADIUS + math.hypot(MARKER_RADIUS, MARKER_HEIGHT / 2) + 0.01) ** 2
+    REST_VELOCITY_SQ = 1e-4 ** 2  # Objects count as at rest below 1e-4 m/s (rad/s)
+
+    # Gripper workspace bounds (keeps it over the table)
+    WORKSPACE_MIN = np.array([-0.5, -0.3, 0.82])
+    WORKSPACE_MAX = np.array([0.5, 0.3, 1.2])
+    WORKSPACE_MIN.flags.writeable = False  # Shared by all instances: freeze
+    WORKSPACE_MAX.flags.writeable = False
+
+    # Gripper orientation never changes (shared tuple, no per-step list)
+    IDENTITY_QUAT = (0.0, 0.0, 0.0, 1.0)
+
+    def __init__(self, headless: bool = True, shared_memory: bool = False,
+                 shared_memory_key: Optional[int] = None):
         """
         Initialize physics simulation.
 
         Args:
             headless: If True, run without GUI (faster). Set False for debugging.
+            shared_memory: Host the physics server in-process behind a shared-memory
+                block, so other processes (viewer, logger) can attach with
+                p.connect(p.SHARED_MEMORY, key=...) and read poses without pickling
+            shared_memory_key: Shared-memory key (PyBullet default if None); use distinct
+                keys for several shared simulations on one node
         """
         # Connect to physics server
-        self.client = p.connect(p.DIRECT if headless else p.GUI)
+        if shared_memory:
+            method = p.SHARED_MEMORY_SERVER if headless else p.GUI_SERVER
+        else:
+            method = p.DIRECT if headless else p.GUI
+        if shared_memory_key is not None:
+            self.client = p.connect(method, key=shared_memory_key)
+        else:
+            self.client = p.connect(method)
 
         # Configure physics
         p.setGravity(0, 0, self.GRAVITY, physicsClientId=self.client)
-        p.setTimeStep(self.PHYSICS_TIMESTEP, physicsClientId=self.client)
+        # One stepSimulation() call advances NUM_SUBSTEPS internal steps of PHYSICS_TIMESTEP
+        # (substepping runs inside Bullet, no Python loop between substeps)
+        p.setPhysicsEngineParameter(
+            fixedTimeStep=self.PHYSICS_TIMESTEP * self.NUM_SUBSTEPS,
+            numSubSteps=self.NUM_SUBSTEPS,
+            # Small 5-body scene: a few solver iterations converge, pyramid friction suffices
+            numSolverIterations=self.NUM_SOLVER_ITERATIONS,
+            enableConeFriction=0,
+            deterministicOverlappingPairs=1,
+            enableFileCaching=0,
+            physicsClientId=self.client
+        )
+
+        # Bind hot-path PyBullet functions once (skips the module attribute lookup per call)
+        self._step_simulation = p.stepSimulation
+        self._get_pose = p.getBasePositionAndOrientation
+        self._reset_pose = p.resetBasePositionAndOrientation
+        self._create_constraint = p.createConstraint
+        self._remove_constraint = p.removeConstraint
+        self._get_velocity = p.getBaseVelocity
 
         # Pre-create collision shapes (reused across resets for efficiency)
         self._create_collision_shapes()
@@ -85,11 +185,24 @@ class PickPlaceSimulation:
         self.gripper_id: Optional[int] = None
         self.grasp_constraint: Optional[int] = None
 
+        # Bodies whose pose get_state() must query (set on reset); the target zone is
+        # static, so its position is cached instead of read back from Bullet each step
+        self._dynamic_body_ids: Tuple[int, ...] = ()
+        self._target_pos = np.zeros(3)
+        self._graspable_pos = np.empty((3, 3))  # Grasp-check scratch buffer
+
         # State tracking
         self.gripper_pos = np.array([0.0, 0.0, self.GRIPPER_START_HEIGHT])
         self.gripper_closed = False
         self.grasped_object_id: Optional[int] = None
+        self._grasp_settled = False  # Held object has converged onto GRASPED_OFFSET
         self.step_count = 0
+        self._gripper_unsynced = True  # Gripper body needs a teleport on the next step
+
+        # Idle-scene tracking (object poses from the last get_state; at-rest flag from
+        # Bullet velocities after the last real physics step)
+        self._last_object_pos: Optional[np.ndarray] = None
+        self._objects_at_rest = False
 
         # Object positions (set on reset)
         self.object_positions: Dict[str, np.ndarray] = {}
@@ -145,19 +258,58 @@ class PickPlaceSimulation:
             Initial state after reset
         """
         # Get 3D positions from manual calibration
-        mapper = CoordinateMapper(world_id)
+        mapper = get_mapper(world_id)
         positions_3d = mapper.get_initial_object_positions_3d()
 
-        # Remove old objects if they exist
-        for obj_id in [self.object_to_pickup_id, self.obstacle_1_id, self.obstacle_2_id,
-                       self.target_marker_id, self.gripper_id]:
-            if obj_id is not None:
-                p.removeBody(obj_id, physicsClientId=self.client)
-
+        # Release any grasp first (constraint references the gripper and held object)
         if self.grasp_constraint is not None:
             p.removeConstraint(self.grasp_constraint, physicsClientId=self.client)
             self.grasp_constraint = None
 
+        target_pos = positions_3d['target_zone']
+        self.gripper_pos = positions_3d['gripper_start'].copy()
+
+        if self.gripper_id is not None:
+            # Bodies already exist: teleport them to the new start poses and zero their
+            # velocities instead of removeBody/createMultiBody (shapes never change)
+            for body_id, pos in (
+                (self.object_to_pickup_id, positions_3d['object_to_pickup']),
+                (self.obstacle_1_id, positions_3d['obstacle_1']),
+                (self.obstacle_2_id, positions_3d['obstacle_2']),
+                (self.target_marker_id, target_pos),
+                (self.gripper_id, self.gripper_pos),
+            ):
+                p.resetBasePositionAndOrientation(body_id, pos, self.IDENTITY_QUAT,
+                                                  physicsClientId=self.client)
+                p.resetBaseVelocity(body_id, (0.0, 0.0, 0.0), (0.0, 0.0, 0.0),
+                                    physicsClientId=self.client)
+        else:
+            self._create_objects(positions_3d)
+
+        # Store positions for state queries
+        self.object_positions = positions_3d
+        self._dynamic_body_ids = (self.object_to_pickup_id, self.obstacle_1_id, self.obstacle_2_id)
+        self._target_pos = target_pos
+
+        # Teleporting does not reliably wake bodies Bullet has put to sleep: wake them so
+        # they settle at their new poses (also clears the idle-scene state)
+        self._wake_objects()
+
+        # Reset state flags
+        self.gripper_closed = False
+        self.grasped_object_id = None
+        self._grasp_settled = False
+        self.step_count = 0
+        self._gripper_unsynced = True  # Start pose may lie outside the clamped workspace
+
+        # Let objects settle (20 physics timesteps)
+        for _ in range(20 // self.NUM_SUBSTEPS):
+            p.stepSimulation(physicsClientId=self.client)
+
+        return self.get_state()
+
+    def _create_objects(self, positions_3d: Dict[str, np.ndarray]):
+        """Create the dynamic objects, target marker and gripper (first reset only)."""
         # Create object to pickup (dynamic, red in visualization)
         obj_pos = positions_3d['object_to_pickup']
         self.object_to_pickup_id = p.createMultiBody(
@@ -195,7 +347,6 @@ class PickPlaceSimulation:
         )
 
         # Create gripper (kinematic control)
-        self.gripper_pos = positions_3d['gripper_start'].copy()
         self.gripper_id = p.createMultiBody(
             baseMass=0,  # Kinematic
             baseCollisionShapeIndex=self.gripper_shape,
@@ -203,19 +354,11 @@ class PickPlaceSimulation:
             physicsClientId=self.client
         )
 
-        # Store positions for state queries
-        self.object_positions = positions_3d
-
-        # Reset state flags
-        self.gripper_closed = False
-        self.grasped_object_id = None
-        self.step_count = 0
-
-        # Let objects settle
-        for _ in range(20):
-            p.stepSimulation(physicsClientId=self.client)
-
-        return self.get_state()
+        # Target zone is a visual goal only: no contacts with anything that can reach it
+        # (bodies are reused across resets, so this filter is set once)
+        for other_id in (self.gripper_id, self.object_to_pickup_id, self.obstacle_1_id, self.obstacle_2_id):
+            p.setCollisionFilterPair(self.target_marker_id, other_id, -1, -1, enableCollision=0,
+                                     physicsClientId=self.client)
 
     def step(self, action: Dict[str, float]) -> SimState:
         """
@@ -235,64 +378,131 @@ class PickPlaceSimulation:
         self.gripper_pos[1] += action['delta_y']
 
         # Clamp gripper to workspace bounds (prevent flying off table)
-        self.gripper_pos[0] = np.clip(self.gripper_pos[0], -0.5, 0.5)
-        self.gripper_pos[1] = np.clip(self.gripper_pos[1], -0.3, 0.3)
-        self.gripper_pos[2] = np.clip(self.gripper_pos[2], 0.82, 1.2)
+        if NUMBA_AVAILABLE:
+            _clamp_nb(self.gripper_pos, self.WORKSPACE_MIN, self.WORKSPACE_MAX)
+        else:
+            np.clip(self.gripper_pos, self.WORKSPACE_MIN, self.WORKSPACE_MAX, out=self.gripper_pos)
 
         # Update gripper state
         self.gripper_closed = action['gripper'] > 0.5
 
-        # Move gripper (kinematic control - instant positioning)
-        p.resetBasePositionAndOrientation(
-            self.gripper_id,
-            self.gripper_pos.tolist(),
-            [0, 0, 0, 1],
-            physicsClientId=self.client
-        )
+        # Move gripper (kinematic control - instant positioning). Grasp/release-only
+        # actions leave it in place, so skip the teleport unless it moved or was never
+        # synced to the clamped position since reset
+        if action['delta_x'] != 0.0 or action['delta_y'] != 0.0 or self._gripper_unsynced:
+            self._reset_pose(
+                self.gripper_id,
+                self.gripper_pos,
+                self.IDENTITY_QUAT,
+                physicsClientId=self.client
+            )
+            self._gripper_unsynced = False
+
+            # The held object lags the teleported gripper until the constraint pulls it
+            # back onto GRASPED_OFFSET, so read its pose from Bullet again until it settles
+            if self.grasped_object_id is not None:
+                self._grasp_settled = False
+
+            # A teleported gripper does not wake sleeping objects it lands next to
+            if self._objects_at_rest and not self._gripper_clear():
+                self._wake_objects()
 
         # Grasp logic - check all graspable objects
-        graspable_objects = [
-            (self.object_to_pickup_id, 'object_to_pickup'),
-            (self.obstacle_1_id, 'obstacle_1'),
-            (self.obstacle_2_id, 'obstacle_2'),
-        ]
-
         if self.gripper_closed and self.grasped_object_id is None:
-            # Try to grasp nearby object
-            for obj_id, obj_name in graspable_objects:
-                obj_pos_raw, _ = p.getBasePositionAndOrientation(obj_id, physicsClientId=self.client)
-                obj_pos = np.array(obj_pos_raw)
-                distance = np.linalg.norm(self.gripper_pos - obj_pos)
-
-                if distance < self.GRASP_DISTANCE_THRESHOLD:
-                    # Grasp this object
-                    self.grasped_object_id = obj_id
-                    self.grasp_constraint = p.createConstraint(
-                        self.gripper_id, -1,
-                        obj_id, -1,
-                        p.JOINT_FIXED,
-                        [0, 0, 0],
-                        [0, 0, -self.GRIPPER_RADIUS - self.MARKER_HEIGHT/2],
-                        [0, 0, 0],
-                        physicsClientId=self.client
-                    )
-                    break
+            # Graspable positions as one (3, 3) SoA buffer, rows in _dynamic_body_ids order
+            graspable_pos = self._graspable_pos
+            for row, obj_id in enumerate(self._dynamic_body_ids):
+                graspable_pos[row] = self._get_pose(obj_id, physicsClientId=self.client)[0]
+
+            # Try to grasp the nearest object within threshold
+            if NUMBA_AVAILABLE:
+                idx = _nearest_within_nb(self.gripper_pos, graspable_pos, self.GRASP_DISTANCE_THRESHOLD_SQ)
+            else:
+                offsets = graspable_pos - self.gripper_pos
+                dist_sq = np.einsum('ij,ij->i', offsets, offsets)
+                idx = int(dist_sq.argmin())
+                if dist_sq[idx] >= self.GRASP_DISTANCE_THRESHOLD_SQ:
+                    idx = -1
+
+            if idx >= 0:
+                # Grasp this object
+                obj_id = self._dynamic_body_ids[idx]
+                self.grasped_object_id = obj_id
+                self._grasp_settled = False
+                self.grasp_constraint = self._create_constraint(
+                    self.gripper_id, -1,
+                    obj_id, -1,
+                    p.JOINT_FIXED,
+                    [0, 0, 0],
+                    [0, 0, -self.GRIPPER_RADIUS - self.MARKER_HEIGHT/2],
+                    [0, 0, 0],
+                    physicsClientId=self.client
+                )
 
         elif not self.gripper_closed and self.grasped_object_id is not None:
             # Release grasp
             if self.grasp_constraint is not None:
-                p.removeConstraint(self.grasp_constraint, physicsClientId=self.client)
+                self._remove_constraint(self.grasp_constraint, physicsClientId=self.client)
                 self.grasp_constraint = None
             self.grasped_object_id = None
 
-        # Step physics simulation (multiple substeps for stability)
-        for _ in range(self.NUM_SUBSTEPS):
-            p.stepSimulation(physicsClientId=self.client)
+        # Step physics simulation (NUM_SUBSTEPS substeps inside Bullet for stability).
+        # Skipped when nothing is held, every object was at rest after the last real step
+        # (Bullet velocities below 1e-4) and the gripper is clear
+        # of them all: the step would leave the scene unchanged
+        if not self._scene_idle():
+            self._step_simulation(physicsClientId=self.client)
+            self._objects_at_rest = self.grasped_object_id is None and self._all_objects_still()
 
         self.step_count += 1
 
         return self.get_state()
 
+    def _wake_objects(self):
+        """Wake every dynamic object and forget the at-rest state (call after teleporting bodies)."""
+        for body_id in self._dynamic_body_ids:
+            p.changeDynamics(body_id, -1, activationState=p.ACTIVATION_STATE_WAKE_UP,
+                             physicsClientId=self.client)
+        self._objects_at_rest = False
+
+    def _all_objects_still(self) -> bool:
+        """True if every dynamic object's linear and angular speed is below the rest threshold."""
+        get_velocity = self._get_velocity
+        client = self.client
+        for body_id in self._dynamic_body_ids:
+            lin, ang = get_velocity(body_id, physicsClientId=client)
+            if (lin[0] * lin[0] + lin[1] * lin[1] + lin[2] * lin[2] >= self.REST_VELOCITY_SQ
+                    or ang[0] * ang[0] + ang[1] * ang[1] + ang[2] * ang[2] >= self.REST_VELOCITY_SQ):
+                return False
+        return True
+
+    def _scene_idle(self) -> bool:
+        """True if stepping physics cannot change any object pose (see step())."""
+        if (self.grasped_object_id is not None or not self._objects_at_rest
+                or self._last_object_pos is None):
+            return False
+        return self._gripper_clear()
+
+    def _gripper_clear(self) -> bool:
+        """True if the gripper is out of reach of every object (poses from the last get_state)."""
+        offsets = self._last_object_pos - self.gripper_pos
+        return bool((np.einsum('ij,ij->i', offsets, offsets) > self.IDLE_CLEARANCE_SQ).all())
+
+    def action_toward(self, target_pos: np.ndarray, speed: float, gripper: float = 0.0) -> Dict[str, float]:
+        """
+        Build a step() action moving the gripper toward target_pos in the XY plane.
+
+        Args:
+            target_pos: (3,) world position to steer toward (Z ignored)
+            speed: Step length (meters)
+            gripper: Gripper command for the action (0.0 = open, 1.0 = closed)
+
+        Returns:
+            Action dictionary for step()
+        """
+        dx, dy = _steer_toward_nb(self.gripper_pos, np.asarray(target_pos, dtype=np.float64), speed)
+        return {'delta_x': dx, 'delta_y': dy, 'gripper': gripper}
+
     def get_state(self) -> SimState:
         """
         Get current simulation state.
@@ -300,18 +510,42 @@ class PickPlaceSimulation:
         Returns:
             Immutable state snapshot with all object positions
         """
-        # Get object positions from physics
-        obj_pos_raw, _ = p.getBasePositionAndOrientation(self.object_to_pickup_id, physicsClientId=self.client)
-        obs1_pos_raw, _ = p.getBasePositionAndOrientation(self.obstacle_1_id, physicsClientId=self.client)
-        obs2_pos_raw, _ = p.getBasePositionAndOrientation(self.obstacle_2_id, physicsClientId=self.client)
-        target_pos_raw, _ = p.getBasePositionAndOrientation(self.target_marker_id, physicsClientId=self.client)
+        # Get dynamic object positions from physics (lookups hoisted out of the loop)
+        get_pose = self._get_pose
+        client = self.client
+        grasped = self.grasped_object_id
+        # Once the grasp constraint has pulled the held body into place it is rigidly
+        # attached, so its position follows from the gripper's. The constraint does not
+        # snap instantly: until then the held body is still read back from Bullet
+        held_pos = None
+        if grasped is not None:
+            held_pos = self.gripper_pos + self.GRASPED_OFFSET
+            if not self._grasp_settled:
+                actual = np.asarray(get_pose(grasped, physicsClientId=client)[0])
+                offset = actual - held_pos
+                self._grasp_settled = bool(offset @ offset <= self.GRASP_SETTLED_TOL_SQ)
+                held_pos = actual
+        obj_pos_raw, obs1_pos_raw, obs2_pos_raw = [
+            held_pos if body_id == grasped
+            else get_pose(body_id, physicsClientId=client)[0]
+            for body_id in self._dynamic_body_ids
+        ]
+        target_pos_raw = self._target_pos  # Static body: never moves after reset
+
+        # One (5, 3) block per snapshot; the SimState fields are row views into it
+        # (one allocation instead of five, and snapshots never alias each other)
+        positions = np.array((self.gripper_pos, obj_pos_raw, obs1_pos_raw, obs2_pos_raw, target_pos_raw))
+
+        # Latest object poses for the idle-scene clearance test (the at-rest flag itself
+        # is only updated in step(), after a real physics step)
+        self._last_object_pos = positions[1:4]
 
         return SimState(
-            gripper_pos=self.gripper_pos.copy(),
-            object_to_pickup_pos=np.array(obj_pos_raw),
-            obstacle_1_pos=np.array(obs1_pos_raw),
-            obstacle_2_pos=np.array(obs2_pos_raw),
-            target_pos=np.array(target_pos_raw),
+            gripper_pos=positions[0],
+            object_to_pickup_pos=positions[1],
+            obstacle_1_pos=positions[2],
+            obstacle_2_pos=positions[3],
+            target_pos=positions[4],
             grasped_object_id=self.grasped_object_id,
             gripper_closed=self.gripper_closed,
             step_count=self.step_count
@@ -342,24 +576,15 @@ if __name__ == "__main__":
     # Test movement toward object
     print("\nTesting movement toward object_to_pickup...")
     for i in range(15):
-        # Calculate direction to object
-        to_object = state.object_to_pickup_pos - state.gripper_pos
-        to_object[2] = 0  # Only move in XY plane
-        to_object_norm = to_object / (np.linalg.norm(to_object) + 1e-6)
-
-        # Move gripper toward object
-        action = {
-            'delta_x': to_object_norm[0] * 0.02,
-            'delta_y': to_object_norm[1] * 0.02,
-            'gripper': 0.0  # Open
-        }
+        # Move gripper toward object (XY plane only, gripper open)
+        action = sim.action_toward(state.object_to_pickup_pos, 0.02, gripper=0.0)
         state = sim.step(action)
 
         if i % 5 == 0:
-            dist = np.linalg.norm(state.gripper_pos - state.object_to_pickup_pos)
+            dist = math.dist(state.gripper_pos, state.object_to_pickup_pos)
             print(f"  Step {i}: gripper at {state.gripper_pos[:2]}, distance: {dist:.3f}m")
 
-    dist_before_grasp = np.linalg.norm(state.gripper_pos - state.object_to_pickup_pos)
+    dist_before_grasp = math.dist(state.gripper_pos, state.object_to_pickup_pos)
     print(f"\nDistance before grasp: {dist_before_grasp:.3f}m (threshold: {sim.GRASP_DISTANCE_THRESHOLD}m)")
 
     # Test grasp
@@ -375,7 +600,7 @@ if __name__ == "__main__":
             # Move toward target
             to_target = state.target_pos - state.gripper_pos
             to_target[2] = min(to_target[2], 0)  # Move down toward floor
-            to_target_norm = to_target / (np.linalg.norm(to_target) + 1e-6)
+            to_target_norm = to_target / (math.hypot(*to_target) + 1e-6)
 
             action = {
                 'delta_x': to_target_norm[0] * 0.03,
@@ -385,7 +610,7 @@ if __name__ == "__main__":
             state = sim.step(action)
 
             if i % 5 == 0:
-                dist_to_goal = np.linalg.norm(state.object_to_pickup_pos - state.target_pos)
+                dist_to_goal = math.dist(state.object_to_pickup_pos, state.target_pos)
                 print(f"  Step {i}: object at Z={state.object_to_pickup_pos[2]:.3f}m, distance to goal: {dist_to_goal:.3f}m")
 
         # Test release
@@ -17,13 +17,219 @@ Requirements:
 
 import argparse
 import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from torch.utils.checkpoint import checkpoint
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Tuple
+from urllib.parse import urlsplit, urlunsplit
 import json
 
+try:
+    import orjson  # Optional: faster results serialization
+except ImportError:
+    orjson = None
+
+from policy_kernels import pad_and_normalize
 from rl_env import DeskCleaningEnv
 
 
+def env_ws_urls(base_url: str, num_envs: int) -> List[str]:
+    """
+    WebSocket URLs for num_envs simulations, one per port starting at base_url's.
+
+    Each sub-environment needs its own JS simulation: envs sharing one socket
+    server would interleave their resets and steps on the same scene.
+    """
+    parts = urlsplit(base_url)
+    port = parts.port or (443 if parts.scheme == 'wss' else 80)
+    return [
+        urlunsplit(parts._replace(netloc=f"{parts.hostname}:{port + i}"))
+        for i in range(num_envs)
+    ]
+
+
+def make_vec_env(world_ids: List[int], ws_urls: List[str], max_objects: int):
+    """
+    Build a vectorized env for rollout collection (stable-baselines3).
+
+    One sub-environment per URL in ws_urls. Worlds are cycled across them (env i runs
+    world_ids[i % len]), so with several worlds each worker owns one world and domain
+    randomization needs no per-episode world switching. Each sub-env is wrapped in
+    Monitor for episode stats.
+
+    Args:
+        world_ids: Worlds to assign to sub-environments
+        ws_urls: Simulation URL of each sub-environment (see env_ws_urls)
+        max_objects: Observation padding, gives every sub-env the same fixed spaces
+
+    Returns:
+        SubprocVecEnv (several URLs) or DummyVecEnv
+    """
+    from stable_baselines3.common.monitor import Monitor
+    from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
+
+    env_fns = [
+        lambda wid=world_ids[i % len(world_ids)], url=url: Monitor(
+            DeskCleaningEnv(world_id=wid, ws_url=url, max_objects=max_objects)
+        )
+        for i, url in enumerate(ws_urls)
+    ]
+
+    if len(env_fns) > 1:
+        return SubprocVecEnv(env_fns, start_method='spawn')
+    return DummyVecEnv(env_fns)
+
+
+def _json_default(obj):
+    """stdlib json fallback for NumPy scalars/arrays (what orjson's OPT_SERIALIZE_NUMPY accepts)."""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _write_json(path: Path, obj: Dict):
+    """
+    Write obj as indented JSON in a single write (orjson if installed, else stdlib json).
+    Both paths accept NumPy scalars and arrays.
+    """
+    if orjson is not None:
+        data = orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    else:
+        data = json.dumps(obj, indent=2, default=_json_default).encode()
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+class _AttentionBlock(nn.Module):
+    """Pre-norm Transformer encoder block; attention runs through F.scaled_dot_product_attention
+    so PyTorch can dispatch to its fused (Flash / memory-efficient) kernels."""
+
+    def __init__(self, dim: int, n_heads: int, ff_dim: int):
+        super().__init__()
+        self.n_heads = n_heads
+        self.norm1 = nn.LayerNorm(dim)
+        self.qkv = nn.Linear(dim, 3 * dim)
+        self.proj = nn.Linear(dim, dim)
+        self.norm2 = nn.LayerNorm(dim)
+        self.ff = nn.Sequential(nn.Linear(dim, ff_dim), nn.GELU(), nn.Linear(ff_dim, dim))
+
+    def forward(self, x: torch.Tensor, attn_mask: torch.Tensor) -> torch.Tensor:
+        B, N, D = x.shape
+        # (B, N, 3D) → 3 × (B, heads, N, D/heads)
+        q, k, v = self.qkv(self.norm1(x)).view(B, N, 3, self.n_heads, D // self.n_heads).permute(2, 0, 3, 1, 4)
+        attn = F.scaled_dot_product_attention(q, k, v, attn_mask=attn_mask)
+        x = x + self.proj(attn.transpose(1, 2).reshape(B, N, D))
+        return x + self.ff(self.norm2(x))
+
+
+class _PolicyNet(nn.Module):
+    """Object-set encoder + Transformer + shared trunk with actor, grasp and critic heads."""
+
+    def __init__(self, state_dim: int, encoder_dim: int, hidden_dim: int, n_heads: int, n_layers: int):
+        super().__init__()
+        # PointNet-style shared per-object MLP
+        self.encoder = nn.Sequential(
+            nn.Linear(state_dim, encoder_dim), nn.ReLU(),
+            nn.Linear(encoder_dim, encoder_dim), nn.ReLU(),
+        )
+        self.embed = nn.Linear(encoder_dim, hidden_dim)
+        self.blocks = nn.ModuleList([
+            _AttentionBlock(hidden_dim, n_heads, 2 * hidden_dim) for _ in range(n_layers)
+        ])
+        self.norm = nn.LayerNorm(hidden_dim)
+        self.trunk = nn.Sequential(nn.Linear(hidden_dim, hidden_dim), nn.ReLU())
+
+        self.move_head = nn.Linear(hidden_dim, 3)      # Mean move Δxyz
+        self.log_std = nn.Parameter(torch.zeros(3))    # State-independent move std
+        self.grasp_head = nn.Linear(hidden_dim, 1)     # Per-object grasp logit
+        self.release_head = nn.Linear(hidden_dim, 1)   # "Release" logit (index n)
+        self.value_head = nn.Linear(hidden_dim, 1)
+
+        # Recompute attention blocks in backward instead of storing their activations
+        self.checkpoint_blocks = False
+
+    def forward(self, objects: torch.Tensor, mask: torch.Tensor):
+        """
+        Args:
+            objects: (B, N, state_dim) padded object features
+            mask: (B, N) bool, True for real objects
+
+        Returns:
+            move_mean (B, 3), grasp_logits (B, N+1), value (B,)
+        """
+        x = self.embed(self.encoder(objects))
+        # Keys: ignore padding. An empty object set would mask every key and SDPA would
+        # return NaN, so such rows attend over their (zero) padding instead; the pooling
+        # and grasp logits below still use the real mask
+        key_mask = mask | ~mask.any(dim=1, keepdim=True)
+        attn_mask = key_mask[:, None, None, :]
+        for block in self.blocks:
+            if self.checkpoint_blocks and torch.is_grad_enabled():
+                x = checkpoint(block, x, attn_mask, use_reentrant=False)
+            else:
+                x = block(x, attn_mask)
+        x = self.norm(x)
+
+        # Masked mean pool over objects → shared trunk
+        m = mask.unsqueeze(-1).to(x.dtype)
+        h = self.trunk((x * m).sum(dim=1) / m.sum(dim=1).clamp(min=1.0))
+
+        obj_logits = self.grasp_head(x).squeeze(-1).masked_fill(~mask, float('-inf'))
+        grasp_logits = torch.cat([obj_logits, self.release_head(h)], dim=-1)
+
+        # Critic always in FP32 (even under autocast) for stable GAE targets
+        with torch.autocast(device_type=h.device.type, enabled=False):
+            value = self.value_head(h.float()).squeeze(-1)
+        return self.move_head(h), grasp_logits, value
+
+
+class _Int8Linear(nn.Module):
+    """
+    Inference-only replacement for nn.Linear: per-output-channel symmetric int8 weights
+    and dynamic per-row int8 activations, multiplied on int8 tensor cores via
+    torch._int_mm on CUDA (float matmul with the weights dequantized once elsewhere).
+    """
+
+    # torch._int_mm needs more than 16 rows in multiples of 8; smaller batches (batch-1
+    # rollouts are 8 or 16 rows) are zero-padded up to this
+    MIN_INT_MM_ROWS = 24
+
+    def __init__(self, linear: nn.Linear):
+        super().__init__()
+        w = linear.weight.detach().float()
+        w_scale = w.abs().amax(dim=1).clamp(min=1e-8) / 127.0
+        self.register_buffer('weight', torch.round(w / w_scale[:, None]).clamp(-127, 127).to(torch.int8))
+        self.register_buffer('w_scale', w_scale)
+        self.register_buffer('bias', None if linear.bias is None else linear.bias.detach().float())
+        # Non-CUDA path: dequantize once instead of on every call
+        self.register_buffer('w_dequant', (self.weight.float() * w_scale[:, None]).t().contiguous(),
+                             persistent=False)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        shape = x.shape
+        x2 = x.reshape(-1, shape[-1]).float()
+
+        # K, N multiples of 8 are checked at swap time; rows are padded here
+        if x2.is_cuda:
+            m = x2.shape[0]
+            m_pad = max(self.MIN_INT_MM_ROWS, -(-m // 8) * 8)
+            if m_pad != m:
+                x2 = F.pad(x2, (0, 0, 0, m_pad - m))
+            x_scale = x2.abs().amax(dim=1, keepdim=True).clamp(min=1e-8) / 127.0
+            x_int8 = torch.round(x2 / x_scale).clamp(-127, 127).to(torch.int8)
+            y = (torch._int_mm(x_int8, self.weight.t()).float() * (x_scale * self.w_scale))[:m]
+        else:
+            y = x2 @ self.w_dequant
+
+        if self.bias is not None:
+            y = y + self.bias
+        return y.reshape(*shape[:-1], -1)
+
+
 class TransformerPolicy:
     """
     Transformer-based policy for desk cleaning.
@@ -45,41 +251,220 @@ class TransformerPolicy:
     Parameters: ~2.4M
     """
 
-    def __init__(self, state_dim: int, action_dim: int):
+    # Object sets are padded up to a multiple of this, so the compiled graph sees a
+    # handful of fixed shapes instead of one per object count
+    OBJECT_BUCKET = 8
+
+    def __init__(self, state_dim: int, action_dim: int, device: str = 'cpu', compile: bool = False,
+                 bf16: bool = False, grad_checkpoint: bool = False):
         """
         Initialize policy network.
 
         Args:
             state_dim: Object feature dimension (11)
             action_dim: Move dimension (3) + grasp dimension (variable)
+            device: Torch device for the network
+            compile: Opt in to wrapping the network with torch.compile (mode='reduce-overhead')
+            bf16: Run evaluate() (PPO updates) under BF16 autocast; weights and
+                optimizer state stay FP32, no loss scaling needed
+            grad_checkpoint: Checkpoint the attention blocks during evaluate() backward
+                (recompute instead of storing activations, for larger minibatches)
         """
         self.state_dim = state_dim
         self.action_dim = action_dim
 
-        # Model architecture (pseudo-code - would use PyTorch)
         self.encoder_dim = 64
         self.hidden_dim = 256
         self.n_heads = 8
         self.n_layers = 4
 
+        self.device = torch.device(device)
+        self.net = _PolicyNet(state_dim, self.encoder_dim, self.hidden_dim, self.n_heads, self.n_layers).to(self.device)
+        self.net.checkpoint_blocks = grad_checkpoint
+        self.bf16 = bf16
+
+        # Compiled callable for rollouts/updates; self.net keeps the plain module (state_dict, saving)
+        self.model = torch.compile(self.net, mode='reduce-overhead') if compile else self.net
+
+        # Captured CUDA graphs for batch-1 inference, keyed by padded object count
+        # (see capture_cuda_graphs)
+        self._graphs: Dict[int, tuple] = {}
+
+        # Per-feature observation normalization (identity until set_normalization)
+        self.obs_mean = np.zeros(state_dim, dtype=np.float32)
+        self.obs_std = np.ones(state_dim, dtype=np.float32)
+
+        # Reused padded (objects, mask) buffers, keyed by padded object count (see pad_objects)
+        self._pad_bufs: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+        n_params = sum(p.numel() for p in self.net.parameters())
+
         print(f"Policy Architecture:")
         print(f"  Input: n_objects × {state_dim} features")
         print(f"  Encoder: PointNet ({state_dim} → {self.encoder_dim})")
         print(f"  Transformer: {self.n_layers} layers, {self.n_heads} heads")
         print(f"  Hidden: {self.hidden_dim} units")
         print(f"  Output: Move(3) + Grasp(n+1) + Value(1)")
-        print(f"  Total parameters: ~2.4M")
+        print(f"  Total parameters: {n_params / 1e6:.1f}M")
 
-    def forward(self, state):
-        """Forward pass (pseudo-implementation)."""
-        pass  # Would use actual PyTorch model
+    def quantize_int8(self):
+        """
+        Post-training quantization for rollout/evaluation: swap every nn.Linear whose in/out
+        features are multiples of 8 (int8 GEMM requirement) for an _Int8Linear. LayerNorm,
+        softmax and the small heads stay in float32. Inference only (no backprop).
+        """
+        def swap(module: nn.Module):
+            for name, child in module.named_children():
+                if isinstance(child, nn.Linear) and child.in_features % 8 == 0 and child.out_features % 8 == 0:
+                    setattr(module, name, _Int8Linear(child))
+                else:
+                    swap(child)
+
+        swap(self.net)
+        self.net.eval()
+        self._graphs.clear()  # Captured graphs reference the old modules
+
+    def set_normalization(self, mean: np.ndarray, std: np.ndarray):
+        """Set per-feature (state_dim,) mean/std applied to object features in pad_objects."""
+        self.obs_mean = np.ascontiguousarray(mean, dtype=np.float32)
+        self.obs_std = np.ascontiguousarray(std, dtype=np.float32)
+
+    def pad_objects(self, objects: np.ndarray) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Normalize an (n, state_dim) object set and pad it to the next bucket size;
+        returns batched (objects, mask).
 
-    def act(self, state, deterministic=False):
-        """Sample action from policy."""
-        pass  # Would sample from actor distribution
+        Padding buffers are reused across calls, so on CPU the returned tensors share
+        memory with them and are overwritten by the next call.
+        """
+        n = len(objects)
+        bucket = self.OBJECT_BUCKET
+        n_pad = max(bucket, -(-n // bucket) * bucket)
+
+        bufs = self._pad_bufs.get(n_pad)
+        if bufs is None:
+            bufs = self._pad_bufs[n_pad] = (
+                np.empty((1, n_pad, self.state_dim), dtype=np.float32),
+                np.empty((1, n_pad), dtype=bool)
+            )
+        padded, mask = bufs
+
+        if pad_and_normalize is not None:
+            pad_and_normalize(np.ascontiguousarray(objects, dtype=np.float32),
+                              self.obs_mean, self.obs_std, padded[0], mask[0])
+        else:
+            np.subtract(objects, self.obs_mean, out=padded[0, :n])
+            padded[0, :n] /= self.obs_std
+            padded[0, n:] = 0.0
+            mask[0, :n] = True
+            mask[0, n:] = False
+
+        return torch.from_numpy(padded).to(self.device), torch.from_numpy(mask).to(self.device)
+
+    def capture_cuda_graphs(self, max_objects: int):
+        """
+        Capture one CUDA graph per object bucket up to max_objects for batch-1 rollouts,
+        so each act() replays the whole forward as a single submission instead of
+        launching every kernel from Python.
 
+        Captures the plain network: use with compile=False (reduce-overhead compile
+        already manages its own CUDA graphs). No-op on CPU.
+        """
+        if self.device.type != 'cuda':
+            return
+
+        bucket = self.OBJECT_BUCKET
+        for n_pad in range(bucket, max(max_objects, 1) + bucket, bucket):
+            if n_pad in self._graphs:
+                continue
+
+            # Persistent input buffers; act() copies each observation into them
+            static_objects = torch.zeros((1, n_pad, self.state_dim), device=self.device)
+            static_mask = torch.zeros((1, n_pad), dtype=torch.bool, device=self.device)
+            static_mask[:, 0] = True
+
+            # Warm up on a side stream (allocator/cuBLAS state) before capture
+            side = torch.cuda.Stream()
+            side.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(side), torch.inference_mode():
+                for _ in range(3):
+                    self.net(static_objects, static_mask)
+            torch.cuda.current_stream().wait_stream(side)
+
+            graph = torch.cuda.CUDAGraph()
+            with torch.inference_mode(), torch.cuda.graph(graph):
+                static_out = self.net(static_objects, static_mask)
+
+            self._graphs[n_pad] = (graph, static_objects, static_mask, static_out)
+
+    def forward(self, objects: torch.Tensor, mask: torch.Tensor):
+        """
+        Forward pass: (move_mean, grasp_logits, value) for padded object batches.
 
-def train_single_world(world_id: int, n_episodes: int, save_dir: Path):
+        Batch-1 inputs with a captured graph replay it; the returned tensors are then the
+        graph's static outputs and are overwritten by the next call.
+        """
+        captured = self._graphs.get(objects.shape[1]) if objects.shape[0] == 1 else None
+        if captured is not None:
+            graph, static_objects, static_mask, static_out = captured
+            static_objects.copy_(objects)
+            static_mask.copy_(mask)
+            graph.replay()
+            return static_out
+
+        return self.model(objects, mask)
+
+    def evaluate(self, objects: torch.Tensor, mask: torch.Tensor):
+        """
+        Differentiable forward pass for PPO updates: (move_mean, grasp_logits, value).
+
+        Runs under BF16 autocast when enabled (the value head stays FP32).
+        """
+        with torch.autocast(device_type=self.device.type, dtype=torch.bfloat16, enabled=self.bf16):
+            return self.model(objects, mask)
+
+    def act(self, state: np.ndarray, deterministic: bool = False) -> Tuple[np.ndarray, int]:
+        """
+        Sample action from policy.
+
+        Args:
+            state: (n, state_dim) object features
+            deterministic: Take distribution modes instead of sampling
+
+        Returns:
+            move: (3,) move delta
+            grasp_id: Object index to grasp, or n to release
+        """
+        n = len(state)
+        objects, mask = self.pad_objects(state)
+
+        with torch.inference_mode():
+            move_mean, grasp_logits, _ = self.forward(objects, mask)
+            if deterministic:
+                move = move_mean
+                grasp = grasp_logits.argmax(dim=-1)
+            else:
+                move = move_mean + self.net.log_std.exp() * torch.randn_like(move_mean)
+                grasp = torch.distributions.Categorical(logits=grasp_logits).sample()
+
+        grasp_id = int(grasp.item())
+        if grasp_id >= n:  # Release slot sits after the padding
+            grasp_id = n
+        return move[0].cpu().numpy(), grasp_id
+
+    def warmup(self, n_objects: int = 1):
+        """Run one forward pass so torch.compile builds its graph before training starts."""
+        self.act(np.zeros((n_objects, self.state_dim), dtype=np.float32), deterministic=True)
+
+
+def train_single_world(
+    world_id: int,
+    n_episodes: int,
+    save_dir: Path,
+    num_envs: int = 1,
+    ws_url: str = 'ws://localhost:5173',
+    max_objects: int = 16
+):
     """
     Train policy on single world.
 
@@ -87,12 +472,20 @@ def train_single_world(world_id: int, n_episodes: int, save_dir: Path):
         world_id: Which Marble world (1, 2, or 3)
         n_episodes: Number of training episodes
         save_dir: Where to save checkpoints and logs
+        num_envs: Parallel environments for rollout collection (one simulation each,
+            on consecutive ports from ws_url)
+        ws_url: WebSocket URL of the (first) JS simulation
+        max_objects: Observation padding for vectorized envs
     """
     print(f"\n{'='*60}")
     print(f"SINGLE-WORLD TRAINING: World {world_id}")
     print(f"{'='*60}\n")
 
-    env = DeskCleaningEnv(world_id=world_id)
+    # Vectorized rollouts: PPO("MlpPolicy", env, n_steps=n_steps // num_envs, ...)
+    if num_envs > 1:
+        env = make_vec_env([world_id], env_ws_urls(ws_url, num_envs), max_objects)
+    else:
+        env = DeskCleaningEnv(world_id=world_id, ws_url=ws_url)
 
     # Training loop (pseudo-code)
     metrics = {
@@ -102,7 +495,7 @@ def train_single_world(world_id: int, n_episodes: int, save_dir: Path):
         'avg_steps': []
     }
 
-    print(f"Training for {n_episodes} episodes...")
+    print(f"Training for {n_episodes} episodes ({num_envs} parallel envs)...")
     print(f"Expected duration: ~8 hours on GPU")
     print(f"\nTraining metrics would be logged here:")
     print(f"  Episode | Reward | Success | Steps | Loss")
@@ -123,8 +516,7 @@ def train_single_world(world_id: int, n_episodes: int, save_dir: Path):
     }
 
     save_dir.mkdir(parents=True, exist_ok=True)
-    with open(save_dir / f'world{world_id}_results.json', 'w') as f:
-        json.dump(results, f, indent=2)
+    _write_json(save_dir / f'world{world_id}_results.json', results)
 
     print(f"\n✓ Training complete")
     print(f"  Final success rate: 94%")
@@ -134,7 +526,14 @@ def train_single_world(world_id: int, n_episodes: int, save_dir: Path):
     env.close()
 
 
-def train_transfer_learning(world_ids: List[int], n_episodes: int, save_dir: Path):
+def train_transfer_learning(
+    world_ids: List[int],
+    n_episodes: int,
+    save_dir: Path,
+    num_envs: int = 1,
+    ws_url: str = 'ws://localhost:5173',
+    max_objects: int = 16
+):
     """
     Train policy with domain randomization across multiple worlds.
 
@@ -142,17 +541,35 @@ def train_transfer_learning(world_ids: List[int], n_episodes: int, save_dir: Pat
         world_ids: List of world IDs to train on
         n_episodes: Total training episodes
         save_dir: Save directory
+        num_envs: Parallel environments, assigned to worlds round-robin (one
+            simulation each, on consecutive ports from ws_url); 1 switches worlds
+            per episode on a single simulation
+        ws_url: WebSocket URL of the (first) JS simulation
+        max_objects: Observation padding for vectorized envs
     """
     print(f"\n{'='*60}")
     print(f"TRANSFER LEARNING: Worlds {world_ids}")
     print(f"{'='*60}\n")
 
-    envs = {wid: DeskCleaningEnv(world_id=wid) for wid in world_ids}
+    if num_envs > 1:
+        env = make_vec_env(world_ids, env_ws_urls(ws_url, num_envs), max_objects)
+        envs = ()
+    else:
+        # Single simulation: the PPO loop picks each episode's world with
+        # env = envs[rng.integers(n)] (tuple index, no dict/key dispatch)
+        env = None
+        envs = tuple(DeskCleaningEnv(world_id=wid, ws_url=ws_url) for wid in world_ids)
+        n = len(envs)
+        rng = np.random.default_rng()
+        print(f"First episode world: {envs[rng.integers(n)].world_id}")
 
     print(f"Training across {len(world_ids)} worlds for {n_episodes} episodes...")
     print(f"Expected duration: ~24 hours on GPU")
     print(f"\nDomain randomization:")
-    print(f"  - Random world selection per episode")
+    if env is not None:
+        print(f"  - Worlds assigned round-robin across {env.num_envs} parallel envs")
+    else:
+        print(f"  - Random world selection per episode")
     print(f"  - Auto-detected table bounds")
     print(f"  - Normalized state coordinates")
 
@@ -182,14 +599,15 @@ def train_transfer_learning(world_ids: List[int], n_episodes: int, save_dir: Pat
     }
 
     save_dir.mkdir(parents=True, exist_ok=True)
-    with open(save_dir / 'transfer_learning_results.json', 'w') as f:
-        json.dump(results, f, indent=2)
+    _write_json(save_dir / 'transfer_learning_results.json', results)
 
     print(f"\n✓ Transfer learning complete")
     print(f"  Model saved to: {save_dir / 'policy_transfer.pth'}")
 
-    for env in envs.values():
+    if env is not None:
         env.close()
+    for world_env in envs:
+        world_env.close()
 
 
 def main():
@@ -199,6 +617,12 @@ def main():
     parser.add_argument('--episodes', type=int, default=10000, help='Number of episodes')
     parser.add_argument('--transfer', action='store_true', help='Enable transfer learning')
     parser.add_argument('--save-dir', type=str, default='./rl_results', help='Save directory')
+    parser.add_argument('--num-envs', type=int, default=1,
+                        help='Parallel environments for rollouts (one simulation per port from --ws-url)')
+    parser.add_argument('--ws-url', type=str, default='ws://localhost:5173',
+                        help='WebSocket URL of the first JS simulation')
+    parser.add_argument('--max-objects', type=int, default=16,
+                        help='Observation padding for parallel environments')
 
     args = parser.parse_args()
     save_dir = Path(args.save_dir)
@@ -212,9 +636,11 @@ def main():
 
     if args.transfer:
         world_ids = [int(w.strip()) for w in args.worlds.split(',')]
-        train_transfer_learning(world_ids, args.episodes, save_dir)
+        train_transfer_learning(world_ids, args.episodes, save_dir,
+                                args.num_envs, args.ws_url, args.max_objects)
     else:
-        train_single_world(args.world, args.episodes, save_dir)
+        train_single_world(args.world, args.episodes, save_dir,
+                           args.num_envs, args.ws_url, args.max_objects)
 
     print(f"\n{'='*60}")
     print("NEXT STEPS")
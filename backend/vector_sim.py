@@ -0,0 +1,205 @@
+"""
+Process-parallel batch of PickPlaceSimulation instances.
+
+PyBullet is single-threaded per client, so rollouts scale by running one DIRECT
+client per worker process and dispatching commands over pipes. Commands are
+pipelined: all workers are sent their command before any result is read.
+"""
+
+import os
+import multiprocessing as mp
+from typing import Dict, List, Optional, Sequence
+
+from sim import PickPlaceSimulation, SimState
+
+# Worker commands
+RESET = 0
+STEP = 1
+GET_STATE = 2
+CLOSE = 3
+
+
+def _worker(conn, core: Optional[int]):
+    """
+    Worker loop: owns one headless simulation and serves (cmd, payload) requests.
+
+    Every reply is (ok, value); on failure value is the exception, re-raised by the parent.
+    """
+    sim = None
+    try:
+        if core is not None:
+            # Pin to one core (avoid migrations between Bullet solver steps)
+            os.sched_setaffinity(0, {core})
+        sim = PickPlaceSimulation(headless=True)
+    except Exception as e:
+        conn.send((False, e))
+        conn.close()
+        return
+
+    conn.send((True, None))  # Ready
+    try:
+        while True:
+            cmd, payload = conn.recv()
+            if cmd == CLOSE:
+                break
+            try:
+                if cmd == STEP:
+                    result = sim.step(payload)
+                elif cmd == RESET:
+                    result = sim.reset(payload)
+                elif cmd == GET_STATE:
+                    result = sim.get_state()
+                else:
+                    raise ValueError(f"Unknown worker command: {cmd}")
+            except Exception as e:
+                conn.send((False, e))
+            else:
+                conn.send((True, result))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        sim.close()
+        conn.close()
+
+
+class VectorPickPlaceSimulation:
+    """
+    N independent simulations stepped in parallel worker processes.
+
+    Usage:
+        vsim = VectorPickPlaceSimulation(num_envs=8)
+        states = vsim.reset([1, 2, 3, 1, 2, 3, 1, 2])
+        states = vsim.step(actions)  # list of N action dicts
+        vsim.close()
+    """
+
+    def __init__(self, num_envs: int, pin_cores: bool = False):
+        """
+        Start worker processes.
+
+        Args:
+            num_envs: Number of parallel simulations (one process each)
+            pin_cores: Pin worker i to the i-th (mod count) core this process may run
+                on (Linux only; ignored elsewhere)
+        """
+        self.num_envs = num_envs
+        self._conns = []
+        self._procs = []
+        self._closed = False
+
+        ctx = mp.get_context('spawn')  # Fresh interpreter per worker (no inherited Bullet client)
+
+        # Allowed cores (respects cpusets / container limits)
+        cores = None
+        if pin_cores and hasattr(os, 'sched_getaffinity'):
+            cores = sorted(os.sched_getaffinity(0))
+
+        for i in range(num_envs):
+            parent_conn, child_conn = ctx.Pipe(duplex=True)
+            proc = ctx.Process(
+                target=_worker,
+                args=(child_conn, cores[i % len(cores)] if cores else None),
+                daemon=True
+            )
+            proc.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._procs.append(proc)
+
+        # Wait for every worker to come up; surface startup failures here
+        try:
+            for conn in self._conns:
+                self._unwrap(conn)
+        except BaseException:
+            self.close()
+            raise
+
+    @staticmethod
+    def _unwrap(conn):
+        """Receive one (ok, value) reply; re-raise a worker-side exception."""
+        try:
+            ok, value = conn.recv()
+        except EOFError:
+            raise RuntimeError("Simulation worker exited unexpectedly") from None
+        if not ok:
+            raise value
+        return value
+
+    def _broadcast(self, cmd: int, payloads: Sequence) -> List[SimState]:
+        """
+        Send one command per worker, then collect all results (pipelined). Every reply
+        is read before the first worker-side exception is re-raised, so pipes stay in sync.
+        """
+        for conn, payload in zip(self._conns, payloads):
+            conn.send((cmd, payload))
+
+        results, error = [], None
+        for conn in self._conns:
+            try:
+                results.append(self._unwrap(conn))
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
+        return results
+
+    def reset(self, world_ids: Sequence[int]) -> List[SimState]:
+        """Reset every simulation; world_ids has one entry per env."""
+        if len(world_ids) != self.num_envs:
+            raise ValueError(f"Expected {self.num_envs} world_ids, got {len(world_ids)}")
+        return self._broadcast(RESET, world_ids)
+
+    def step(self, actions: Sequence[Dict[str, float]]) -> List[SimState]:
+        """Step every simulation with its own action dict (see PickPlaceSimulation.step)."""
+        if len(actions) != self.num_envs:
+            raise ValueError(f"Expected {self.num_envs} actions, got {len(actions)}")
+        return self._broadcast(STEP, actions)
+
+    def get_state(self) -> List[SimState]:
+        """Current state of every simulation."""
+        return self._broadcast(GET_STATE, [None] * self.num_envs)
+
+    def close(self):
+        """Stop all workers."""
+        if self._closed:
+            return
+        for conn in self._conns:
+            try:
+                conn.send((CLOSE, None))
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        for conn in self._conns:
+            conn.close()
+        self._closed = True
+
+    def __del__(self):
+        self.close()
+
+
+# Test script
+if __name__ == "__main__":
+    import time
+
+    print("Testing VectorPickPlaceSimulation...")
+
+    num_envs = min(4, os.cpu_count() or 1)
+    vsim = VectorPickPlaceSimulation(num_envs=num_envs)
+    print(f"✓ Started {num_envs} workers")
+
+    states = vsim.reset([(i % 3) + 1 for i in range(num_envs)])
+    print(f"✓ Reset complete: {len(states)} states")
+
+    action = {'delta_x': 0.01, 'delta_y': 0.0, 'gripper': 0.0}
+    n_steps = 200
+    t0 = time.perf_counter()
+    for _ in range(n_steps):
+        states = vsim.step([action] * num_envs)
+    elapsed = time.perf_counter() - t0
+    print(f"✓ {n_steps * num_envs} env steps in {elapsed:.2f}s ({n_steps * num_envs / elapsed:.0f} steps/s)")
+
+    vsim.close()
+    print("✓ Workers shut down")
@@ -9,11 +9,229 @@ Output:
     - test_outputs/world{1,2,3}_verified.png with all 5 dots positioned
 """
 
+import os
+import functools
 import cv2
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import List, Optional, Tuple
 
-from world_calibration_manual import get_manual_positions
+try:
+    from joblib import Parallel, delayed  # Optional: verify large worlds in parallel processes
+except ImportError:
+    Parallel = delayed = None
+
+from image_cache import load_cached_image
+from numba_compat import njit, NUMBA_AVAILABLE
+from world_calibration_manual import get_manual_positions, get_manual_positions_array, LABELS
+
+# Dot visualization parameters
+DOT_RADIUS = 3  # Small dots (3px filled)
+OUTLINE_RADIUS = 6  # Outline for visibility
+OUTLINE_THICKNESS = 1
+
+
+# Colors (BGR for cv2)
+COLORS = {
+    'object_to_pickup': (0, 0, 255),      # Red
+    'obstacle_1': (255, 0, 0),            # Blue
+    'obstacle_2': (0, 255, 255),          # Yellow
+    'gripper_start': (255, 255, 255),     # White
+    'target_zone': (0, 255, 0)            # Green
+}
+
+SPRITE_RADIUS = OUTLINE_RADIUS + OUTLINE_THICKNESS  # Half-size of a dot sprite (covers the outline)
+
+# Work (input bytes) below which parallel jobs run on threads: a joblib process pool
+# re-imports this module (sprites, JIT warmup) in every worker, which costs more than
+# decoding a few small images
+PROCESS_MIN_BYTES = 32 * 1024 * 1024
+
+
+def _make_sprite(color: Tuple[int, int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rasterize one dot (filled circle + black outline) into a small patch.
+
+    Returns:
+        sprite: (2R+1, 2R+1, 3) uint8 patch
+        mask: (2R+1, 2R+1) bool, True where the sprite has pixels
+    """
+    size = 2 * SPRITE_RADIUS + 1
+    center = (SPRITE_RADIUS, SPRITE_RADIUS)
+    sprite = np.zeros((size, size, 3), dtype=np.uint8)
+    mask = np.zeros((size, size), dtype=np.uint8)
+
+    cv2.circle(sprite, center, DOT_RADIUS, color, -1)
+    cv2.circle(mask, center, DOT_RADIUS, 1, -1)
+    cv2.circle(sprite, center, OUTLINE_RADIUS, (0, 0, 0), OUTLINE_THICKNESS)
+    cv2.circle(mask, center, OUTLINE_RADIUS, 1, OUTLINE_THICKNESS)
+
+    return sprite, mask.astype(bool)
+
+
+# Rasterized once, then stacked in LABELS order (sprite k draws label k)
+SPRITES = {label: _make_sprite(color) for label, color in COLORS.items()}
+SPRITE_STACK = np.stack([SPRITES[label][0] for label in LABELS])
+MASK_STACK = np.stack([SPRITES[label][1] for label in LABELS])
+
+# All sprites share one footprint (same radii): (K, 2) pixel offsets (dy, dx) from the
+# center and the (L, K, 3) colors each label writes there
+_SPRITE_OFFSETS = np.argwhere(MASK_STACK[0]) - SPRITE_RADIUS
+_SPRITE_PIXELS = SPRITE_STACK[:, MASK_STACK[0]]
+
+
+def _stamp_dots(imgs: np.ndarray, wids: np.ndarray, xy: np.ndarray, labels: np.ndarray):
+    """
+    Stamp M dots across a stack of images with one fancy-indexed write.
+
+    Args:
+        imgs: (N, H, W, 3) stacked images, modified in place
+        wids: (M,) image index of each dot
+        xy: (M, 2) dot centers (x, y)
+        labels: (M,) LABELS index of each dot (selects its sprite)
+    """
+    ys = xy[:, 1, None] + _SPRITE_OFFSETS[None, :, 0]  # (M, K)
+    xs = xy[:, 0, None] + _SPRITE_OFFSETS[None, :, 1]
+    inside = (ys >= 0) & (ys < imgs.shape[1]) & (xs >= 0) & (xs < imgs.shape[2])
+    ws = np.broadcast_to(wids[:, None], ys.shape)
+    imgs[ws[inside], ys[inside], xs[inside]] = _SPRITE_PIXELS[labels][inside]
+
+
+@njit(cache=True, boundscheck=False)
+def _stamp_dots_nb(imgs, wids, xy, labels, sprites, masks, r):
+    """Same as _stamp_dots as one loop nest over dots and sprite pixels, clipped to the image."""
+    h, w = imgs.shape[1], imgs.shape[2]
+    for k in range(xy.shape[0]):
+        img = imgs[wids[k]]
+        sprite, mask = sprites[labels[k]], masks[labels[k]]
+        cx, cy = xy[k, 0], xy[k, 1]
+        for sy in range(2 * r + 1):
+            y = cy + sy - r
+            if y < 0 or y >= h:
+                continue
+            for sx in range(2 * r + 1):
+                x = cx + sx - r
+                if x < 0 or x >= w or not mask[sy, sx]:
+                    continue
+                for c in range(3):
+                    img[y, x, c] = sprite[sy, sx, c]
+
+
+if NUMBA_AVAILABLE:
+    # Warm the JIT at import so the first run doesn't pay compile latency
+    _stamp_dots_nb(np.zeros((1, 1, 1, 3), np.uint8), np.zeros(1, np.int64), np.zeros((1, 2), np.int16),
+                   np.zeros(1, np.int64), SPRITE_STACK, MASK_STACK, SPRITE_RADIUS)
+
+
+@functools.lru_cache(maxsize=None)
+def _find_exterior(world_dir: str) -> Tuple[Path, ...]:
+    """
+    Sorted exterior images (*exterior*.png) in a world directory.
+
+    Cached per directory (scandir + name check, no per-entry Path/stat); call
+    _find_exterior.cache_clear() after adding or renaming images.
+    """
+    try:
+        with os.scandir(world_dir) as entries:
+            names = sorted(
+                entry.name for entry in entries
+                if 'exterior' in entry.name and entry.name.endswith('.png') and entry.is_file()
+            )
+    except FileNotFoundError:
+        return ()
+    return tuple(Path(world_dir) / name for name in names)
+
+
+def _decode_exterior(img_path: Path) -> Optional[np.ndarray]:
+    """Decode and resize an exterior image to 224×224 BGR (None if it fails to load)."""
+    img = cv2.imread(str(img_path), cv2.IMREAD_COLOR)
+    if img is None:
+        return None
+    return cv2.resize(img, (224, 224), interpolation=cv2.INTER_AREA)
+
+
+def _load_exterior(img_path: Path) -> Optional[np.ndarray]:
+    """
+    Decode and resize a world's exterior image to 224×224 BGR (same as observation builder will use).
+
+    Takes the image path resolved by the caller (_find_exterior, cached in the parent
+    process). The resized image is kept in a .npy disk cache next to the source (see
+    image_cache.load_cached_image), so repeat runs skip PNG decode and resize entirely.
+
+    Returns:
+        Resized image, or None if it failed to load
+    """
+    cache_path = img_path.parent / "_cache_verify_exterior_224.npy"
+    return load_cached_image(img_path, cache_path, _decode_exterior, (224, 224, 3))
+
+
+LABELS_SHORT = {
+    'object_to_pickup': 'OBJ1',
+    'obstacle_1': 'OBS1',
+    'obstacle_2': 'OBS2',
+    'gripper_start': 'GRIP',
+    'target_zone': 'GOAL'
+}
+
+
+def _label_and_save(world_id: int, img: np.ndarray, output_dir: Path) -> str:
+    """
+    Add label text to one world's dotted image and save it.
+
+    Returns:
+        Report text for the world (printed by the caller, in world order)
+    """
+    positions = get_manual_positions(world_id)
+
+    # Label text
+    for label, (x, y) in positions.items():
+        cv2.putText(
+            img,
+            LABELS_SHORT[label],
+            (x + 8, y - 8),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.35,
+            COLORS[label],
+            1,
+            cv2.LINE_AA
+        )
+
+    # Save verification image
+    output_path = output_dir / f"world{world_id}_verified.png"
+    cv2.imwrite(str(output_path), img)
+
+    return "\n".join([
+        f"\n✓ World {world_id}:",
+        f"    Object to pickup (RED):   {positions['object_to_pickup']}",
+        f"    Obstacle 1 (BLUE):        {positions['obstacle_1']}",
+        f"    Obstacle 2 (YELLOW):      {positions['obstacle_2']}",
+        f"    Gripper start (WHITE):    {positions['gripper_start']}",
+        f"    Target zone (GREEN):      {positions['target_zone']}",
+        f"    → Saved to: {output_path.name}",
+    ])
+
+
+def _parallel_map(fn, *iterables, work_bytes: int = 0) -> List:
+    """
+    fn over zipped iterables, one job per item: joblib processes when available and
+    work_bytes reaches PROCESS_MIN_BYTES, otherwise threads (decode/encode release the
+    GIL) with cv2's own thread pool limited to 1 meanwhile to avoid oversubscribing
+    the cores.
+    """
+    items = list(zip(*iterables))
+    n_jobs = max(1, min(len(items), os.cpu_count() or 1))
+
+    if Parallel is not None and work_bytes >= PROCESS_MIN_BYTES:
+        return Parallel(n_jobs=n_jobs)(delayed(fn)(*args) for args in items)
+
+    cv2_threads = cv2.getNumThreads()
+    cv2.setNumThreads(1)
+    try:
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            return list(pool.map(lambda args: fn(*args), items))
+    finally:
+        cv2.setNumThreads(cv2_threads)
 
 
 def verify_all_worlds(assets_dir: Path, output_dir: Path):
@@ -21,98 +239,61 @@ def verify_all_worlds(assets_dir: Path, output_dir: Path):
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Dot visualization parameters
-    DOT_RADIUS = 3  # Small dots (3px filled)
-    OUTLINE_RADIUS = 6  # Outline for visibility
-    OUTLINE_THICKNESS = 1
-
-    # Colors (BGR for cv2)
-    colors = {
-        'object_to_pickup': (0, 0, 255),      # Red
-        'obstacle_1': (255, 0, 0),            # Blue
-        'obstacle_2': (0, 255, 255),          # Yellow
-        'gripper_start': (255, 255, 255),     # White
-        'target_zone': (0, 255, 0)            # Green
-    }
-
-    labels_short = {
-        'object_to_pickup': 'OBJ1',
-        'obstacle_1': 'OBS1',
-        'obstacle_2': 'OBS2',
-        'gripper_start': 'GRIP',
-        'target_zone': 'GOAL'
-    }
-
     print("\n" + "="*60)
     print("  CALIBRATION VERIFICATION")
     print("="*60)
 
-    for world_id in [1, 2, 3]:
-        # Load exterior image
-        world_dir = assets_dir / f"world{world_id}"
-        exterior_files = list(world_dir.glob("*exterior*.png"))
-
-        if not exterior_files:
-            print(f"✗ World {world_id}: No exterior image found")
-            continue
-
-        img_path = exterior_files[0]
-        img = cv2.imread(str(img_path))
-
-        if img is None:
-            print(f"✗ World {world_id}: Failed to load {img_path}")
-            continue
-
-        # Resize to 224×224 (same as observation builder will use)
-        img_resized = cv2.resize(img, (224, 224), interpolation=cv2.INTER_AREA)
-
-        # Convert BGR → RGB for display
-        img_rgb = cv2.cvtColor(img_resized, cv2.COLOR_BGR2RGB)
-
-        # Get manual positions
-        try:
-            positions = get_manual_positions(world_id)
-        except ValueError as e:
-            print(f"✗ World {world_id}: {e}")
-            continue
-
-        # Draw all dots
-        for label, (x, y) in positions.items():
-            color = colors[label]
-            short_label = labels_short[label]
-
-            # Filled circle
-            cv2.circle(img_rgb, (x, y), DOT_RADIUS, color, -1)
-
-            # Black outline for visibility
-            cv2.circle(img_rgb, (x, y), OUTLINE_RADIUS, (0, 0, 0), OUTLINE_THICKNESS)
-
-            # Label text
-            cv2.putText(
-                img_rgb,
-                short_label,
-                (x + 8, y - 8),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.35,
-                color,
-                1,
-                cv2.LINE_AA
-            )
+    world_ids = [1, 2, 3]
+    reports = {}
+
+    # Resolve image paths here (workers would not share _find_exterior's cache), then
+    # load the images in parallel
+    img_paths = {}
+    for world_id in world_ids:
+        exterior_files = _find_exterior(str(assets_dir / f"world{world_id}"))
+        if exterior_files:
+            img_paths[world_id] = exterior_files[0]
+        else:
+            reports[world_id] = f"✗ World {world_id}: No exterior image found"
+
+    source_bytes = sum(img_path.stat().st_size for img_path in img_paths.values())
+    loaded = _parallel_map(_load_exterior, img_paths.values(), work_bytes=source_bytes)
+
+    ok_ids, ok_imgs = [], []
+    for (world_id, img_path), img_resized in zip(img_paths.items(), loaded):
+        if img_resized is None:
+            reports[world_id] = f"✗ World {world_id}: Failed to load {img_path}"
+        else:
+            try:
+                get_manual_positions(world_id)
+            except ValueError as e:
+                reports[world_id] = f"✗ World {world_id}: {e}"
+                continue
+            ok_ids.append(world_id)
+            ok_imgs.append(img_resized)
+
+    if ok_ids:
+        # Stack the worlds into one (N_worlds, 224, 224, 3) BGR array and draw every dot of
+        # every world in one pass (colors are BGR): filled circle + black outline for
+        # visibility, from the pre-rasterized sprites
+        imgs = np.stack(ok_imgs)
+        n_labels = len(LABELS)
+        wids = np.repeat(np.arange(len(ok_ids)), n_labels)
+        xy = np.concatenate([get_manual_positions_array(world_id) for world_id in ok_ids])
+        labels = np.tile(np.arange(n_labels), len(ok_ids))
 
-        # Convert back to BGR for saving
-        img_output = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR)
+        if NUMBA_AVAILABLE:
+            _stamp_dots_nb(imgs, wids, xy, labels, SPRITE_STACK, MASK_STACK, SPRITE_RADIUS)
+        else:
+            _stamp_dots(imgs, wids, xy, labels)
 
-        # Save verification image
-        output_path = output_dir / f"world{world_id}_verified.png"
-        cv2.imwrite(str(output_path), img_output)
+        # Label text + PNG encode in parallel
+        saved = _parallel_map(_label_and_save, ok_ids, imgs, [output_dir] * len(ok_ids),
+                              work_bytes=imgs.nbytes)
+        reports.update(zip(ok_ids, saved))
 
-        print(f"\n✓ World {world_id}:")
-        print(f"    Object to pickup (RED):   {positions['object_to_pickup']}")
-        print(f"    Obstacle 1 (BLUE):        {positions['obstacle_1']}")
-        print(f"    Obstacle 2 (YELLOW):      {positions['obstacle_2']}")
-        print(f"    Gripper start (WHITE):    {positions['gripper_start']}")
-        print(f"    Target zone (GREEN):      {positions['target_zone']}")
-        print(f"    → Saved to: {output_path.name}")
+    for world_id in world_ids:
+        print(reports[world_id])
 
     print("\n" + "="*60)
     print("✓ VERIFICATION COMPLETE")
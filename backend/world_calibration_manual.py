@@ -11,6 +11,7 @@ Task: Pick and place with obstacles
 All positions are in 224×224 pixel coordinates.
 """
 
+import numpy as np
 from typing import Dict, Tuple
 
 MANUAL_CALIBRATIONS = {
@@ -40,8 +41,27 @@ MANUAL_CALIBRATIONS = {
 
 }
 
+LABELS = ('object_to_pickup', 'obstacle_1', 'obstacle_2', 'gripper_start', 'target_zone')
+LABEL_IDX = {label: i for i, label in enumerate(LABELS)}
+
+# Contiguous (N_worlds, 5, 2) table: CALIBRATIONS[WORLD_IDX[world_id], LABEL_IDX[label]] = (x, y)
+WORLD_IDX = {world_id: i for i, world_id in enumerate(sorted(MANUAL_CALIBRATIONS))}
+CALIBRATIONS = np.array(
+    [[MANUAL_CALIBRATIONS[world_id][label] for label in LABELS] for world_id in sorted(MANUAL_CALIBRATIONS)],
+    dtype=np.int16
+)
+CALIBRATIONS.flags.writeable = False
+
+
 def get_manual_positions(world_id: int) -> Dict[str, Tuple[int, int]]:
     """Get manually calibrated positions for a world."""
     if world_id not in MANUAL_CALIBRATIONS:
         raise ValueError(f"No calibration for world {world_id}. Available: {list(MANUAL_CALIBRATIONS.keys())}")
     return MANUAL_CALIBRATIONS[world_id]
+
+
+def get_manual_positions_array(world_id: int) -> np.ndarray:
+    """Get manually calibrated positions for a world as a read-only (5, 2) int16 array in LABELS order."""
+    if world_id not in WORLD_IDX:
+        raise ValueError(f"No calibration for world {world_id}. Available: {list(MANUAL_CALIBRATIONS.keys())}")
+    return CALIBRATIONS[WORLD_IDX[world_id]]
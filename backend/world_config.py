@@ -3,13 +3,14 @@ Per-world calibration configuration.
 Maps physics coordinates to actual table positions in Marble photos.
 """
 
+import numpy as np
 from dataclasses import dataclass
 from typing import Tuple
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WorldCalibration:
-    """Calibration parameters for a specific Marble world."""
+    """Calibration parameters for a specific Marble world (immutable and hashable)."""
     world_id: int
 
     # Table region in 224×224 image (pixels)
@@ -52,6 +53,49 @@ WORLD_CALIBRATIONS = {
 }
 
 
+# Structure-of-arrays view of WORLD_CALIBRATIONS indexed directly by world_id (row 0 unused),
+# for projecting many points from many worlds in one vectorized call (projection.py's
+# kernels and project_batch below; ObservationBuilder.world_to_pixels goes through them)
+CALIB = np.zeros(max(WORLD_CALIBRATIONS) + 1, dtype=[
+    ('cx', 'i2'), ('cy', 'i2'),  # table_center_px
+    ('r', 'i2'),                 # table_radius_px
+    ('fx', 'i2'), ('fy', 'i2'),  # floor_center_px
+    ('ppm', 'f4'),               # pixels_per_meter
+])
+for _cal in WORLD_CALIBRATIONS.values():
+    CALIB[_cal.world_id] = (*_cal.table_center_px, _cal.table_radius_px,
+                            *_cal.floor_center_px, _cal.pixels_per_meter)
+del _cal
+CALIB.flags.writeable = False
+
+
+def project_batch(world_ids: np.ndarray, xyz: np.ndarray, image_size: int = 224) -> np.ndarray:
+    """
+    Project N physics points to pixels, each with its own world's calibration.
+
+    NumPy implementation behind projection.project_points when numba is unavailable.
+
+    Args:
+        world_ids: (N,) integer world ids (must be calibrated worlds)
+        xyz: (N, 3) physics coordinates (Z ignored, top-down projection)
+        image_size: Output image size; pixels are clamped to [0, image_size)
+
+    Returns:
+        (N, 2) int32 array of (pixel_x, pixel_y)
+    """
+    cal = CALIB[np.asarray(world_ids)]
+    xyz = np.asarray(xyz)
+    ppm = cal['ppm'].astype(np.float64)
+
+    # Meters → pixel offset (truncated toward zero, image Y increases downward), then add center
+    px = cal['cx'] + np.trunc(xyz[:, 0] * ppm)
+    py = cal['cy'] + np.trunc(-xyz[:, 1] * ppm)
+
+    out = np.stack([px, py], axis=1)
+    np.clip(out, 0, image_size - 1, out=out)
+    return out.astype(np.int32)
+
+
 def get_world_calibration(world_id: int) -> WorldCalibration:
     """Get calibration for a specific world."""
     if world_id not in WORLD_CALIBRATIONS:
@@ -356,6 +356,21 @@ export class RLEnvironment {
     };
   }
 
+  /**
+   * Execute actions in order and return one step result per action
+   * (backs the Python client's 'step_batch' message: one round trip for K steps).
+   * Stops early once an episode ends.
+   */
+  stepBatch(actions) {
+    const results = [];
+    for (const action of actions) {
+      const result = this.step(action);
+      results.push(result);
+      if (result.done) break;
+    }
+    return results;
+  }
+
   /**
    * Get current state (normalized for RL)
    */